@@ -8,26 +8,109 @@ import re
 import html
 import json
 import os
-import glob
+import sys
+import fnmatch
+import pickle
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
 
-def extract_set_info_from_tcg_collector(html_content):
+# orjson is optional - it writes the (large) card data file much faster than the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Extraction results from previous runs, keyed by file content (see read_and_extract)
+PARSED_CACHE_DIR = Path('.cache') / 'parsed'
+
+# Static patterns are compiled once at import time rather than on every card
+SET_INFO_PATTERN = re.compile(r'<span id="card-search-result-title-set-like-name">([^<]+)</span><span id="card-search-result-title-set-code">([^<]+)</span>', re.IGNORECASE)
+PAGE_TITLE_PATTERN = re.compile(r'<title>([^<]+) card list \(International TCG\) – TCG Collector</title>', re.IGNORECASE)
+CARD_NAME_PATTERN = re.compile(r'<a[^>]*href="[^"]*cards/[^"]*"[^>]*title="([^"]*\([^)]*\))"[^>]*class="[^"]*card-list-item-entry-text[^"]*"[^>]*>\s*([^<]+)\s*</a>', re.IGNORECASE)
+CARD_TITLE_PATTERN = re.compile(r'\(([^)]+)\s+(\d+(?:/\d+)?)\)')
+EXPANSION_CODE_PATTERN = re.compile(r'<span[^>]*card-list-item-expansion-code[^>]*>\s*([^<]+)\s*</span>', re.IGNORECASE)
+# Characters for which re.IGNORECASE and str.lower() disagree: letters re also pairs with a different
+# letter (e.g. 'ſ' with 's', 'ι' with 'ͅ'), final sigma, and 'İ' (which lowercases to two characters)
+IGNORECASE_MISMATCH_CHARS = '\u0130\u0131\u017f\u0399\u039c\u03a3\u03b9\u03bc\u03c2\u03c3\u03d0\u03d1\u03d5\u03d6\u03f0\u03f1\u03f5\u1c80\u1c81\u1c82\u1c83\u1c84\u1c85\u1c86\u1c87\u1e9b\u1fbe\u1fd3\u1fe3\ua64a\ua64b\ufb06'
+CARD_ID_PATTERN = re.compile(r'data-card-id="(\d+)"', re.IGNORECASE)
+# Literal start of every card id attribute, for jumping between candidates with search_from_literal
+CARD_ID_PREFIX = 'data-card-id="'
+INDICATOR_SPAN_PATTERN = re.compile(r'<span[^>]*class="([^"]*card-collection-card-indicator[^"]*)"[^>]*>', re.IGNORECASE)
+# Cardmarket table rows containing a card link in the format "CardName (SET NUM)"
+CARDMARKET_ROW_PATTERN = re.compile(r'<tr[^>]*>(.*?<td[^>]*class="(?:info|name[^"]*)"[^>]*>.*?<a[^>]*>([^<]*\([A-Z0-9]+\s+\d+\))</a>.*?)</tr>', re.IGNORECASE | re.DOTALL)
+CARDMARKET_CARD_TEXT_PATTERN = re.compile(r'^(.*?)\s*\(([A-Z0-9]+)\s+(\d+)\)$')
+
+# The same set names, codes and rarity titles are unescaped for card after card
+unescape_html = lru_cache(maxsize=4096)(html.unescape)
+
+# Per-card patterns embed the card's name/number/id, so they're compiled on demand and
+# cached here - there are more of them than re's own internal cache holds
+
+@lru_cache(maxsize=4096)
+def card_context_pattern(name):
+    """Pattern for the expansion code following a card's name link"""
+    return re.compile(rf'<a[^>]*>{re.escape(name)}</a>.*?<span[^>]*card-list-item-expansion-code[^>]*>\s*([^<]+)\s*</span>', re.DOTALL | re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
+def card_id_title_pattern(name, number):
+    """Pattern for a data-card-id whose title mentions both the card name and number"""
+    return re.compile(rf'data-card-id="(\d+)"[^>]*title="[^"]*{re.escape(name)}[^"]*{re.escape(number)}[^"]*"', re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
+def number_context_pattern(number, total_count=None):
+    """Pattern for the first data-card-id after a card number (with total count if known)"""
+    if total_count:
+        return re.compile(rf'{re.escape(number)}/{re.escape(total_count)}.*?data-card-id="(\d+)"', re.IGNORECASE | re.DOTALL)
+    # For cards without total count, just match the card number alone
+    return re.compile(rf'{re.escape(number)}.*?data-card-id="(\d+)"', re.IGNORECASE | re.DOTALL)
+
+@lru_cache(maxsize=4096)
+def card_id_name_pattern(name):
+    """Pattern for a data-card-id whose full card name mentions the card name"""
+    return re.compile(rf'data-card-id="(\d+)"[^>]*data-full-card-name-without-tcg-region="[^"]*{re.escape(name)}[^"]*"', re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
+def indicator_pattern(card_id):
+    """Pattern for the collection indicator block following a card id"""
+    return re.compile(rf'data-card-id="{card_id}".*?card-collection-card-controls-indicators.*?</button>', re.DOTALL | re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
+def rarity_patterns(card_id):
+    """Rarity image patterns (src/title/class, class/src/title, title/src/class) and the text rarity pattern for a card id"""
+    return (
+        re.compile(rf'data-card-id="{card_id}".*?<img[^>]*src="([^"]*)"[^>]*title="([^"]*)"[^>]*class="[^"]*card-rarity-symbol[^"]*"', re.DOTALL | re.IGNORECASE),
+        re.compile(rf'data-card-id="{card_id}".*?<img[^>]*class="[^"]*card-rarity-symbol[^"]*"[^>]*src="([^"]*)"[^>]*title="([^"]*)"', re.DOTALL | re.IGNORECASE),
+        re.compile(rf'data-card-id="{card_id}".*?<img[^>]*title="([^"]*)"[^>]*src="([^"]*)"[^>]*class="[^"]*card-rarity-symbol[^"]*"', re.DOTALL | re.IGNORECASE),
+        re.compile(rf'data-card-id="{card_id}".*?<div[^>]*class="[^"]*card-list-item-rarity[^"]*".*?<span[^>]*class="[^"]*card-list-item-entry-text[^"]*"[^>]*>([^<]+)</span>', re.DOTALL | re.IGNORECASE),
+    )
+
+@lru_cache(maxsize=4096)
+def rarity_context_patterns(name, number):
+    """Rarity image patterns after and before a card's name and number"""
+    return (
+        re.compile(rf'{re.escape(name)}.*?{re.escape(number)}.*?<img[^>]*src="([^"]*)"[^>]*class="[^"]*card-rarity-symbol[^"]*"[^>]*title="([^"]*)"', re.DOTALL | re.IGNORECASE),
+        re.compile(rf'<img[^>]*src="([^"]*)"[^>]*class="[^"]*card-rarity-symbol[^"]*"[^>]*title="([^"]*)".*?{re.escape(name)}.*?{re.escape(number)}', re.DOTALL | re.IGNORECASE),
+    )
+
+def extract_set_info_from_tcg_collector(html_content, html_lower=None):
     """Extract set name and code from TCG Collector HTML"""
     # Primary pattern: Adjacent span elements with specific IDs
-    pattern = r'<span id="card-search-result-title-set-like-name">([^<]+)</span><span id="card-search-result-title-set-code">([^<]+)</span>'
-    match = re.search(pattern, html_content, re.IGNORECASE)
+    match = search_from_literal(SET_INFO_PATTERN, '<span id="card-search-result-title-set-like-name">', html_content, html_lower)
 
     if match:
-        set_name = html.unescape(match.group(1).strip())
-        set_code = html.unescape(match.group(2).strip())
+        set_name = unescape_html(match.group(1).strip())
+        set_code = unescape_html(match.group(2).strip())
         return set_name, set_code
 
     # Fallback: Extract from page title
-    title_pattern = r'<title>([^<]+) card list \(International TCG\) – TCG Collector</title>'
-    title_match = re.search(title_pattern, html_content, re.IGNORECASE)
+    title_match = search_from_literal(PAGE_TITLE_PATTERN, '<title>', html_content, html_lower)
     if title_match:
-        set_name = html.unescape(title_match.group(1).strip())
+        set_name = unescape_html(title_match.group(1).strip())
         return set_name, None
 
     return None, None
@@ -52,47 +135,47 @@ def convert_rarity_src_to_local_path(src):
     # Simply prepend 'data/' to make it relative from the root directory where HTML files are generated
     return f"data/{src}"
 
-def extract_card_rarity(html_content, card):
+def extract_card_rarity(html_content, card, card_block=None, html_lower=None):
     """Extract rarity information for a specific card"""
     rarity_data = None
+    if card_block is None:
+        card_block = (0, len(html_content))
 
     # First, try to find rarity using card_id if available
     if card.get('card_id'):
         card_id = card['card_id']
+        src_title_pattern, class_first_pattern, title_first_pattern, text_rarity_pattern = rarity_patterns(card_id)
 
         # Look for rarity within a reasonable distance after the card_id
         # Extract both src and title from the rarity image
-        rarity_search_pattern = rf'data-card-id="{card_id}".*?<img[^>]*src="([^"]*)"[^>]*title="([^"]*)"[^>]*class="[^"]*card-rarity-symbol[^"]*"'
-        rarity_match = re.search(rarity_search_pattern, html_content, re.DOTALL | re.IGNORECASE)
+        # These are anchored on the card id, so search the card's own block before the rest of the page
+        rarity_match = search_card_block(src_title_pattern, html_content, card_block)
 
         if not rarity_match:
             # Try alternative order: class, then src, then title
-            rarity_search_pattern = rf'data-card-id="{card_id}".*?<img[^>]*class="[^"]*card-rarity-symbol[^"]*"[^>]*src="([^"]*)"[^>]*title="([^"]*)"'
-            rarity_match = re.search(rarity_search_pattern, html_content, re.DOTALL | re.IGNORECASE)
+            rarity_match = search_card_block(class_first_pattern, html_content, card_block)
 
         if not rarity_match:
             # Try another variation: title before src
-            rarity_search_pattern = rf'data-card-id="{card_id}".*?<img[^>]*title="([^"]*)"[^>]*src="([^"]*)"[^>]*class="[^"]*card-rarity-symbol[^"]*"'
-            rarity_match = re.search(rarity_search_pattern, html_content, re.DOTALL | re.IGNORECASE)
+            rarity_match = search_card_block(title_first_pattern, html_content, card_block)
             if rarity_match:
                 # Swap order since title came first in this pattern
                 rarity_data = {
-                    'src': convert_rarity_src_to_local_path(html.unescape(rarity_match.group(2).strip())),
-                    'title': html.unescape(rarity_match.group(1).strip())
+                    'src': convert_rarity_src_to_local_path(unescape_html(rarity_match.group(2).strip())),
+                    'title': unescape_html(rarity_match.group(1).strip())
                 }
 
         if rarity_match and not rarity_data:
             rarity_data = {
-                'src': convert_rarity_src_to_local_path(html.unescape(rarity_match.group(1).strip())),
-                'title': html.unescape(rarity_match.group(2).strip())
+                'src': convert_rarity_src_to_local_path(unescape_html(rarity_match.group(1).strip())),
+                'title': unescape_html(rarity_match.group(2).strip())
             }
         elif not rarity_match:
             # Check for M24-style text rarity (— symbol)
-            text_rarity_pattern = rf'data-card-id="{card_id}".*?<div[^>]*class="[^"]*card-list-item-rarity[^"]*".*?<span[^>]*class="[^"]*card-list-item-entry-text[^"]*"[^>]*>([^<]+)</span>'
-            text_match = re.search(text_rarity_pattern, html_content, re.DOTALL | re.IGNORECASE)
+            text_match = search_card_block(text_rarity_pattern, html_content, card_block)
 
             if text_match:
-                text_content = html.unescape(text_match.group(1).strip())
+                text_content = unescape_html(text_match.group(1).strip())
                 # Handle M24 special case: — symbol means no rarity
                 if text_content == '—':
                     rarity_data = None
@@ -101,46 +184,111 @@ def extract_card_rarity(html_content, card):
 
     # Fallback: try to find rarity by card name and number context
     if rarity_data is None and card.get('name') and card.get('number'):
-        name = card['name']
-        number = card['number']
+        # Use a broader search pattern around the card name and number
+        context_pattern, reverse_pattern = rarity_context_patterns(card['name'], card['number'])
 
-        # Create a broader search pattern around the card name and number
-        context_pattern = rf'{re.escape(name)}.*?{re.escape(number)}.*?<img[^>]*src="([^"]*)"[^>]*class="[^"]*card-rarity-symbol[^"]*"[^>]*title="([^"]*)"'
-        context_match = re.search(context_pattern, html_content, re.DOTALL | re.IGNORECASE)
+        # Both patterns need the name somewhere on the page, and the context match starts with it,
+        # so a literal find tells us where to start searching (or that there's nothing to find)
+        name_pos = html_lower.find(card['name'].lower()) if html_lower is not None else 0
+        context_match = context_pattern.search(html_content, name_pos) if name_pos >= 0 else None
 
         if context_match:
             rarity_data = {
-                'src': convert_rarity_src_to_local_path(html.unescape(context_match.group(1).strip())),
-                'title': html.unescape(context_match.group(2).strip())
+                'src': convert_rarity_src_to_local_path(unescape_html(context_match.group(1).strip())),
+                'title': unescape_html(context_match.group(2).strip())
             }
         else:
             # Try reverse order (rarity might come before name/number)
-            reverse_pattern = rf'<img[^>]*src="([^"]*)"[^>]*class="[^"]*card-rarity-symbol[^"]*"[^>]*title="([^"]*)".*?{re.escape(name)}.*?{re.escape(number)}'
-            reverse_match = re.search(reverse_pattern, html_content, re.DOTALL | re.IGNORECASE)
+            reverse_match = reverse_pattern.search(html_content) if name_pos >= 0 else None
 
             if reverse_match:
                 rarity_data = {
-                    'src': convert_rarity_src_to_local_path(html.unescape(reverse_match.group(1).strip())),
-                    'title': html.unescape(reverse_match.group(2).strip())
+                    'src': convert_rarity_src_to_local_path(unescape_html(reverse_match.group(1).strip())),
+                    'title': unescape_html(reverse_match.group(2).strip())
                 }
 
     return rarity_data
 
+def lowercase_for_literal_search(html_content):
+    """Lowercased copy of the page for case-insensitive str.find, or None if that could disagree with re.IGNORECASE"""
+    if any(ch in html_content for ch in IGNORECASE_MISMATCH_CHARS):
+        return None
+    return html_content.lower()
+
+def search_from_literal(pattern, prefix, html_content, html_lower=None):
+    """pattern.search() for an IGNORECASE pattern that always starts with the lowercase literal prefix"""
+    if html_lower is None:
+        return pattern.search(html_content)
+    # A match can only start where the prefix occurs, so jump between those with str.find
+    # instead of letting the regex engine try every position in the page
+    pos = html_lower.find(prefix)
+    while pos >= 0:
+        match = pattern.match(html_content, pos)
+        if match:
+            return match
+        pos = html_lower.find(prefix, pos + 1)
+    return None
+
+def index_card_blocks(html_content):
+    """Map each data-card-id to the span from its first occurrence up to the next card's first occurrence"""
+    first_seen = {}
+    for match in CARD_ID_PATTERN.finditer(html_content):
+        first_seen.setdefault(match.group(1), match.start())
+
+    # Dict order follows document order, so each block ends where the next card's starts -
+    # at the opening '<' of the tag carrying the next card's id, so no tag straddles the boundary
+    starts = list(first_seen.items())
+    blocks = {}
+    for i, (card_id, start) in enumerate(starts):
+        if i + 1 < len(starts):
+            next_start = starts[i + 1][1]
+            tag_start = html_content.rfind('<', start, next_start)
+            end = tag_start if tag_start > start else next_start
+        else:
+            end = len(html_content)
+        blocks[card_id] = (start, end)
+    return blocks
+
+def search_card_block(pattern, html_content, block):
+    """Search a card's own block first, only falling back to the rest of the document if needed"""
+    start, end = block
+    # Patterns are anchored on the card id, so nothing can match before the block starts
+    return pattern.search(html_content, start, end) or pattern.search(html_content, start)
+
 def extract_tcg_collector_cards(html_content):
-    """Extract card data from TCG Collector HTML"""
+    """Extract card data and a set code -> set name mapping from TCG Collector HTML"""
     cards = []
+    set_mapping = {}
+
+    html_lower = lowercase_for_literal_search(html_content)
 
     # Extract set information dynamically from the HTML
-    dynamic_set_name, dynamic_set_code = extract_set_info_from_tcg_collector(html_content)
+    dynamic_set_name, dynamic_set_code = extract_set_info_from_tcg_collector(html_content, html_lower)
+    # Every card in the file shares these, so intern them once rather than keeping per-card copies
+    if dynamic_set_name:
+        dynamic_set_name = sys.intern(dynamic_set_name)
+    if dynamic_set_code:
+        dynamic_set_code = sys.intern(dynamic_set_code)
 
     # Look for card name patterns to find individual cards
     # Each card has a unique structure we can target
-    name_pattern = r'<a[^>]*href="[^"]*cards/[^"]*"[^>]*title="([^"]*\([^)]*\))"[^>]*class="[^"]*card-list-item-entry-text[^"]*"[^>]*>\s*([^<]+)\s*</a>'
-    name_matches = re.findall(name_pattern, html_content, re.IGNORECASE)
+    name_matches = CARD_NAME_PATTERN.findall(html_content)
+
+    # Index where each card's markup starts once, so per-card searches don't rescan the whole page
+    card_blocks = index_card_blocks(html_content)
+
+    # Without a set code in the header, cards whose own code can't be found fall back to the
+    # most common set code in the file - the same for every card, so work it out once
+    fallback_set_code = None
+    if not dynamic_set_code:
+        all_codes = EXPANSION_CODE_PATTERN.findall(html_content)
+        if all_codes:
+            most_common_code = Counter(all_codes).most_common(1)[0][0].strip()
+            fallback_set_code = sys.intern(unescape_html(most_common_code))
 
     for title, name in name_matches:
         card = {
-            'name': html.unescape(name.strip()),
+            'name': unescape_html(name.strip()),
             'source': 'tcg_collector'
         }
 
@@ -152,11 +300,11 @@ def extract_tcg_collector_cards(html_content):
 
         # Extract card number and set info from title
         # Title format: "Bulbasaur (Scarlet & Violet 151 001/165)" or "Basic Grass Energy (Scarlet & Violet Energies 001)"
-        title_match = re.search(r'\(([^)]+)\s+(\d+(?:/\d+)?)\)', title)
+        title_match = CARD_TITLE_PATTERN.search(title)
         if title_match:
             # Only use title set name if we don't have dynamic set name
             if not dynamic_set_name:
-                card['set_name'] = html.unescape(title_match.group(1).strip())
+                card['set_name'] = sys.intern(unescape_html(title_match.group(1).strip()))
             full_number = title_match.group(2)
             # Store both the normalized number (for matching) and total count (for display)
             if '/' in full_number:
@@ -169,42 +317,35 @@ def extract_tcg_collector_cards(html_content):
 
         # Look for set code near this card (fallback if dynamic extraction didn't work)
         if not dynamic_set_code:
-            card_context_pattern = rf'<a[^>]*>{re.escape(name)}</a>.*?<span[^>]*card-list-item-expansion-code[^>]*>\s*([^<]+)\s*</span>'
-            code_match = re.search(card_context_pattern, html_content, re.DOTALL | re.IGNORECASE)
+            code_match = None
+            # The pattern matches '<a ...>name</a>', so find the first '>name</a>' literally and start the
+            # regex just after the '>' before it - no match can start earlier, and none exists if it's missing
+            link_pos = html_lower.find(f'>{name.lower()}</a>') if html_lower is not None else 0
+            if link_pos >= 0:
+                search_start = html_content.rfind('>', 0, link_pos) + 1 if link_pos else 0
+                code_match = card_context_pattern(name).search(html_content, search_start)
             if code_match:
-                card['set_code'] = html.unescape(code_match.group(1).strip())
-            else:
-                # Try a broader search for set code without requiring specific proximity to card name
-                general_code_pattern = r'<span[^>]*card-list-item-expansion-code[^>]*>\s*([^<]+)\s*</span>'
-                all_codes = re.findall(general_code_pattern, html_content, re.IGNORECASE)
-                if all_codes:
-                    # Use the most common set code found in the file
-                    from collections import Counter
-                    most_common_code = Counter(all_codes).most_common(1)[0][0].strip()
-                    card['set_code'] = html.unescape(most_common_code)
+                card['set_code'] = sys.intern(unescape_html(code_match.group(1).strip()))
+            elif fallback_set_code:
+                # Use the most common set code found in the file
+                card['set_code'] = fallback_set_code
 
         # Look for collection indicators near this card
         # Try to find data-card-id for this specific card using both name and number for uniqueness
+        # (each lookup scans the whole page, so the regex is only tried where a card id or number starts)
         if card.get('number'):
             # First try: match using title attribute which should contain the full card info
-            title_pattern = rf'data-card-id="(\d+)"[^>]*title="[^"]*{re.escape(name)}[^"]*{re.escape(card["number"])}[^"]*"'
-            card_id_match = re.search(title_pattern, html_content, re.IGNORECASE)
+            card_id_match = search_from_literal(card_id_title_pattern(name, card['number']), CARD_ID_PREFIX, html_content, html_lower)
 
             # Second try: look in broader context around the specific card number
             if not card_id_match:
-                total_fallback = card.get("total_count")
-                if total_fallback:
-                    number_context_pattern = rf'{re.escape(card["number"])}/{re.escape(total_fallback)}.*?data-card-id="(\d+)"'
-                else:
-                    # For cards without total count, just match the card number alone
-                    number_context_pattern = rf'{re.escape(card["number"])}.*?data-card-id="(\d+)"'
-                context_match = re.search(number_context_pattern, html_content, re.IGNORECASE | re.DOTALL)
+                number_prefix = f"{card['number']}/{card['total_count']}" if card.get('total_count') else card['number']
+                context_match = search_from_literal(number_context_pattern(card['number'], card.get('total_count')), number_prefix.lower(), html_content, html_lower)
                 if context_match:
                     card_id_match = context_match
         else:
             # Fallback to original method if no number available
-            card_id_pattern = rf'data-card-id="(\d+)"[^>]*data-full-card-name-without-tcg-region="[^"]*{re.escape(name)}[^"]*"'
-            card_id_match = re.search(card_id_pattern, html_content, re.IGNORECASE)
+            card_id_match = search_from_literal(card_id_name_pattern(name), CARD_ID_PREFIX, html_content, html_lower)
 
         has_regular = False
         has_reverse = False
@@ -214,49 +355,50 @@ def extract_tcg_collector_cards(html_content):
             card_id = card_id_match.group(1)
             card['card_id'] = card_id  # Store card ID for image fetching
             # Look for indicators for this specific card
-            indicator_pattern = rf'data-card-id="{card_id}".*?card-collection-card-controls-indicators.*?</button>'
-            indicator_match = re.search(indicator_pattern, html_content, re.DOTALL | re.IGNORECASE)
+            card_block = card_blocks.get(card_id, (0, len(html_content)))
+            indicator_match = search_card_block(indicator_pattern(card_id), html_content, card_block)
 
             if indicator_match:
                 indicator_html = indicator_match.group(0)
 
                 # Find all indicator spans and determine what variants exist and their status
-                all_spans = re.findall(r'<span[^>]*class="([^"]*card-collection-card-indicator[^"]*)"[^>]*>', indicator_html, re.IGNORECASE)
-
-                # Check for standard/normal variant
+                all_spans = INDICATOR_SPAN_PATTERN.findall(indicator_html)
+
+                # Classify the spans in one pass - only the first standard-set and first parallel-set
+                # span count, and Normal is always listed before Reverse Holo
+                normal_variant = None
+                reverse_variant = None
+                seen_standard = False
+                seen_parallel = False
                 for class_attr in all_spans:
-                    if 'card-collection-card-indicator-standard-set' in class_attr:
+                    # Check for standard/normal variant
+                    if not seen_standard and 'card-collection-card-indicator-standard-set' in class_attr:
+                        seen_standard = True
                         has_dot = 'card-collection-card-indicator-with-dot' in class_attr
                         is_active = 'active' in class_attr
                         # Include if has dot OR is active (meaning variant exists)
                         if has_dot or is_active:
-                            variants.append({
+                            normal_variant = {
                                 'type': 'Normal',
                                 'has_card': is_active
-                            })
-                        break
+                            }
 
-                # Check for parallel/reverse holo variant
-                for class_attr in all_spans:
-                    if 'card-collection-card-indicator-parallel-set' in class_attr:
-                        has_dot = 'card-collection-card-indicator-with-dot' in class_attr
-                        is_active = 'active' in class_attr
+                    # Check for parallel/reverse holo variant
+                    if not seen_parallel and 'card-collection-card-indicator-parallel-set' in class_attr:
+                        seen_parallel = True
                         # Always include parallel variant if the span exists (variant exists in set)
-                        variants.append({
+                        reverse_variant = {
                             'type': 'Reverse Holo',
-                            'has_card': is_active
-                        })
-                        break
+                            'has_card': 'active' in class_attr
+                        }
 
-                # Check for other variants (we'll ignore these for now but detect them)
-                for class_attr in all_spans:
-                    if 'card-collection-card-indicator-other-variants' in class_attr:
-                        has_dot = 'card-collection-card-indicator-with-dot' in class_attr
-                        is_active = 'active' in class_attr
-                        if has_dot:  # Other variants exist but we'll skip them
-                            pass  # Could add special variants here if needed
+                    if seen_standard and seen_parallel:
                         break
 
+                # Other variants (card-collection-card-indicator-other-variants) exist on some cards,
+                # but we skip them for now - special variants could be added here if needed
+                variants = [variant for variant in (normal_variant, reverse_variant) if variant]
+
                 # If no variants detected, assume normal exists
                 if not variants:
                     variants.append({
@@ -265,37 +407,39 @@ def extract_tcg_collector_cards(html_content):
                     })
 
         # Extract rarity for this card
-        rarity_data = extract_card_rarity(html_content, card)
+        rarity_data = extract_card_rarity(html_content, card, card_blocks.get(card.get('card_id')), html_lower)
 
-        # Create a card entry for each variant
-        for variant in variants:
-            variant_card = card.copy()
-            variant_card['variant_type'] = variant['type']
-            variant_card['has_card'] = variant['has_card']
-            variant_card['rarity_data'] = rarity_data  # Add rarity data to each variant
-            cards.append(variant_card)
+        # Create a card entry for each variant, built in one go from the shared card fields
+        cards.extend({
+            **card,
+            'variant_type': variant['type'],
+            'has_card': variant['has_card'],
+            'rarity_data': rarity_data,  # Add rarity data to each variant
+        } for variant in variants)
 
-    return cards
+        # Record the set this card belongs to while we have it to hand, rather than rescanning every card afterwards
+        if variants and card.get('set_code') and card.get('set_name'):
+            set_mapping[card['set_code']] = card['set_name']
+
+    return cards, set_mapping
 
 def extract_cardmarket_cards(html_content):
     """Extract card data from Cardmarket purchase pages"""
     cards = []
 
-    # Updated pattern for new Cardmarket HTML structure
     # Look for full table rows containing td elements with card links in format "CardName (SET NUM)"
     # This captures both the card info AND the full row content for variant detection
-    row_pattern = r'<tr[^>]*>(.*?<td[^>]*class="(?:info|name[^"]*)"[^>]*>.*?<a[^>]*>([^<]*\([A-Z0-9]+\s+\d+\))</a>.*?)</tr>'
-    row_matches = re.findall(row_pattern, html_content, re.IGNORECASE | re.DOTALL)
+    row_matches = CARDMARKET_ROW_PATTERN.findall(html_content)
 
     for row_content, card_text in row_matches:
         # Parse the card text in format "CardName (SET NUM)"
         # Extract card name and the (SET NUM) pattern
-        card_match = re.match(r'^(.*?)\s*\(([A-Z0-9]+)\s+(\d+)\)$', card_text.strip())
+        card_match = CARDMARKET_CARD_TEXT_PATTERN.match(card_text.strip())
         if not card_match:
             continue
 
-        card_name = html.unescape(card_match.group(1).strip())
-        set_code = card_match.group(2).strip()
+        card_name = unescape_html(card_match.group(1).strip())
+        set_code = sys.intern(card_match.group(2).strip())
         card_number = card_match.group(3).strip()
 
         # Skip empty card names
@@ -309,7 +453,7 @@ def extract_cardmarket_cards(html_content):
             variant_type = 'Reverse Holo'
 
         # Use set code as-is, no need for mapping
-        set_name = f'Set {set_code}'
+        set_name = sys.intern(f'Set {set_code}')
 
         card = {
             'name': card_name,
@@ -325,15 +469,117 @@ def extract_cardmarket_cards(html_content):
 
     return cards
 
-def build_set_mapping_from_tcg_cards(tcg_cards):
-    """Build a mapping of set codes to set names from TCG Collector cards"""
-    set_mapping = {}
-    for card in tcg_cards:
-        set_code = card.get('set_code')
-        set_name = card.get('set_name')
-        if set_code and set_name:
-            set_mapping[set_code] = set_name
-    return set_mapping
+@lru_cache(maxsize=None)
+def extractor_source_hash():
+    """Hash of this module's source, so cached results are discarded whenever the extraction code changes"""
+    return blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
+
+def load_parsed_cache(cache_file):
+    """Load a cached extraction result, or None if it's missing or unreadable"""
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None  # Missing or unreadable cache entry - the file just gets re-parsed
+
+def write_cache_file(cache_file, content):
+    """Write a cache entry via a temporary file, so readers in other processes never see it half-written"""
+    PARSED_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_file, cache_file)
+
+def parsed_cache_ref_file(file_path, extractor):
+    """The .ref cache entry recording which parsed result belongs to a file path"""
+    ref_key = blake2b(f"{os.path.abspath(file_path)}:{extractor.__name__}".encode('utf-8'), digest_size=16)
+    return PARSED_CACHE_DIR / f"{ref_key.hexdigest()}.ref"
+
+def read_and_extract(file_path, extractor):
+    """Read an HTML file and run an extractor over its contents, reusing the cached result for unchanged files"""
+    extractor_key = f"{extractor.__name__}:{extractor_source_hash()}"
+
+    # A file with the same path, size and mtime as last run is taken to be unchanged, so its result
+    # is found without reading or hashing it - the path's .ref file records the size, mtime and
+    # extractor it was last parsed with, and names the content-keyed entry below
+    file_stat = os.stat(file_path)
+    stat_signature = f"{file_stat.st_size}:{file_stat.st_mtime_ns}:{extractor_key}"
+    ref_file = parsed_cache_ref_file(file_path, extractor)
+    try:
+        ref_signature, _, ref_target = ref_file.read_text(encoding='utf-8').partition('\n')
+    except OSError:
+        ref_signature = None
+    if ref_signature == stat_signature:
+        result = load_parsed_cache(PARSED_CACHE_DIR / ref_target)
+        if result is not None:
+            return result
+
+    # Otherwise key on the content itself, so touched or copied files still hit the cache
+    raw_content = Path(file_path).read_bytes()
+    cache_key = blake2b(raw_content, digest_size=16)
+    cache_key.update(extractor_key.encode('utf-8'))
+    cache_file = PARSED_CACHE_DIR / f"{cache_key.hexdigest()}.pkl"
+
+    result = load_parsed_cache(cache_file)
+    if result is None:
+        # Decode the same way a text-mode read would, including universal newline translation
+        content = raw_content.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        result = extractor(content)
+        write_cache_file(cache_file, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+
+    # One .ref per path, overwritten whenever the file changes
+    write_cache_file(ref_file, f"{stat_signature}\n{cache_file.name}".encode('utf-8'))
+    return result
+
+def prune_parsed_cache(files_by_extractor):
+    """Delete parsed cache entries that no current source file refers to"""
+    # Each current file's .ref (written by read_and_extract this run) names the .pkl it uses
+    keep = set()
+    for extractor, file_paths in files_by_extractor:
+        for file_path in file_paths:
+            ref_file = parsed_cache_ref_file(file_path, extractor)
+            keep.add(ref_file.name)
+            try:
+                keep.add(ref_file.read_text(encoding='utf-8').partition('\n')[2])
+            except OSError:
+                pass
+
+    # Anything else is from edited, removed or since-reparsed pages, or an older extractor
+    try:
+        with os.scandir(PARSED_CACHE_DIR) as entries:
+            stale_files = [entry.path for entry in entries
+                           if entry.name not in keep and entry.name.endswith(('.pkl', '.ref', '.tmp'))]
+    except FileNotFoundError:
+        return
+    for stale_file in stale_files:
+        try:
+            os.remove(stale_file)
+        except OSError:
+            pass
+
+def extract_files(file_paths, extractor):
+    """Run extractor over each file, spreading files across worker processes when there's more than one"""
+    if len(file_paths) > 1:
+        # Extraction is CPU-bound regex work, so separate processes sidestep the GIL
+        # Some platforms/sandboxes can't start worker processes - extraction still works one file at a time.
+        # Only a pool that can't start or loses its workers falls back; errors reading a file propagate as they are
+        try:
+            executor = ProcessPoolExecutor(max_workers=min(len(file_paths), os.cpu_count() or 1))
+        except (OSError, NotImplementedError) as e:
+            print(f"Parallel extraction unavailable ({e}), processing files sequentially")
+        else:
+            with executor:
+                try:
+                    # Workers are started as tasks are submitted
+                    futures = [executor.submit(read_and_extract, file_path, extractor) for file_path in file_paths]
+                except (OSError, BrokenProcessPool) as e:
+                    print(f"Parallel extraction unavailable ({e}), processing files sequentially")
+                else:
+                    try:
+                        return [future.result() for future in futures]
+                    except BrokenProcessPool as e:
+                        print(f"Parallel extraction failed ({e}), processing files sequentially")
+    return [read_and_extract(file_path, extractor) for file_path in file_paths]
 
 def extract_all_data():
     """Extract all card data from HTML files and return structured data"""
@@ -343,14 +589,21 @@ def extract_all_data():
         print("Error: data/ folder not found. Please create it and add your HTML files.")
         return None
 
-    # Find all TCG Collector HTML files
-    tcg_files = list(data_dir.glob("*TCG Collector*.html"))
+    # Find all TCG Collector and Cardmarket HTML files from a single directory listing
+    # (fnmatch follows the platform's filename case rules, as Path.glob did)
+    tcg_files = []
+    cm_files = []
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if fnmatch.fnmatch(entry.name, "*TCG Collector*.html"):
+                tcg_files.append(data_dir / entry.name)
+            if fnmatch.fnmatch(entry.name, "*Cardmarket*.html"):
+                cm_files.append(data_dir / entry.name)
+
     if not tcg_files:
         print("No TCG Collector HTML files found in data/ folder")
         return None
 
-    # Find all Cardmarket HTML files
-    cm_files = list(data_dir.glob("*Cardmarket*.html"))
     if not cm_files:
         print("No Cardmarket HTML files found in data/ folder (orders delivered/removed)")
         cm_files = []  # Continue with empty list instead of returning None
@@ -359,13 +612,14 @@ def extract_all_data():
 
     # Process all TCG Collector files
     all_tcg_cards = []
-    for tcg_file in tcg_files:
+    set_mapping = {}
+    cards_by_file = []
+    for tcg_file, (tcg_cards, file_set_mapping) in zip(tcg_files, extract_files(tcg_files, extract_tcg_collector_cards)):
         print(f"Reading TCG Collector file: {tcg_file.name}")
-        with open(tcg_file, 'r', encoding='utf-8') as f:
-            tcg_content = f.read()
-
-        tcg_cards = extract_tcg_collector_cards(tcg_content)
         all_tcg_cards.extend(tcg_cards)
+        cards_by_file.append((tcg_file, tcg_cards))
+        # Merged in file order, so a set code seen in several files keeps its last name as before
+        set_mapping.update(file_set_mapping)
         print(f"  Found {len(tcg_cards)} cards")
 
     print(f"Total TCG Collector cards: {len(all_tcg_cards)}")
@@ -373,37 +627,42 @@ def extract_all_data():
     # Process all Cardmarket files
     all_cm_cards = []
     if cm_files:
-        for cm_file in cm_files:
+        for cm_file, cm_cards in zip(cm_files, extract_files(cm_files, extract_cardmarket_cards)):
             print(f"Reading Cardmarket file: {cm_file.name}")
-            with open(cm_file, 'r', encoding='utf-8') as f:
-                cm_content = f.read()
-
-            cm_cards = extract_cardmarket_cards(cm_content)
             all_cm_cards.extend(cm_cards)
+            cards_by_file.append((cm_file, cm_cards))
             print(f"  Found {len(cm_cards)} cards")
     else:
         print("No Cardmarket files to process")
 
     print(f"Total Cardmarket cards: {len(all_cm_cards)}")
 
-    # Build set mapping
-    set_mapping = build_set_mapping_from_tcg_cards(all_tcg_cards)
+    # Every current file now has an up-to-date cache entry, so drop the ones nothing refers to
+    prune_parsed_cache([(extract_tcg_collector_cards, tcg_files), (extract_cardmarket_cards, cm_files)])
 
     # Update Cardmarket cards with proper set names from TCG Collector mapping
     for card in all_cm_cards:
-        set_code = card.get('set_code')
-
-        if set_code and set_code in set_mapping:
-            card['set_name'] = set_mapping[set_code]
+        # Every Cardmarket card has a set code, and mapping values are never empty, so one .get covers it
+        set_name = set_mapping.get(card['set_code'])
+        if set_name:
+            card['set_name'] = set_name
 
     # Get source file information for change detection
     source_files = {}
     for file_path in list(tcg_files) + list(cm_files):
+        file_stat = file_path.stat()
         source_files[str(file_path)] = {
-            'size': file_path.stat().st_size,
-            'mtime': file_path.stat().st_mtime
+            'size': file_stat.st_size,
+            'mtime': file_stat.st_mtime
         }
 
+    # Record which source files feed each set (by the set name reports group on), so a
+    # changed file only triggers regeneration of the sets it actually contributes to
+    source_files_by_set = {}
+    for file_path, cards in cards_by_file:
+        for set_name in dict.fromkeys(card.get('set_name', 'Unknown') for card in cards):
+            source_files_by_set.setdefault(set_name, []).append(str(file_path))
+
     # Print some sample data for debugging
     if all_tcg_cards:
         print("\nSample TCG Collector card:")
@@ -419,6 +678,7 @@ def extract_all_data():
         "cardmarket_cards": all_cm_cards,
         "set_mapping": set_mapping,
         "source_files": source_files,
+        "source_files_by_set": source_files_by_set,
         "stats": {
             "tcg_files_count": len(tcg_files),
             "cardmarket_files_count": len(cm_files),
@@ -427,10 +687,33 @@ def extract_all_data():
         }
     }
 
+def iter_json_chunks(data):
+    """Yield data encoded as indent=2 JSON, one top-level value (or one card of a card list) at a time"""
+    yield b'{'
+    for i, (key, value) in enumerate(data.items()):
+        yield b'\n  ' if i == 0 else b',\n  '
+        yield orjson.dumps(key) + b': '
+        if isinstance(value, list) and value:
+            # Card lists are encoded card by card, so the whole file is never built up in memory at once
+            yield b'['
+            for j, item in enumerate(value):
+                yield b'\n    ' if j == 0 else b',\n    '
+                yield orjson.dumps(item, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n    ')
+            yield b'\n  ]'
+        else:
+            yield orjson.dumps(value, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  ')
+    yield b'\n}' if data else b'}'
+
 def save_data(data, filename="card_data.json"):
     """Save extracted data to JSON file"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        # Same layout as json.dump(indent=2, ensure_ascii=False), streamed to disk as it's encoded
+        with open(filename, 'wb') as f:
+            f.writelines(iter_json_chunks(data))
+    else:
+        # json.dump already writes its output piece by piece as it encodes
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
     print(f"Data saved to {filename}")
 
 def main():
@@ -7,12 +7,73 @@ Generates HTML reports from extracted card data
 import json
 import html
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
-import glob
+import fnmatch
 import re
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from hashlib import blake2b
 from pathlib import Path
-from urllib.parse import quote
+
+# orjson is optional - it's much faster than the stdlib json for loading card data and encoding the embedded metrics blobs
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Content hashes of previously written output files, used to skip unchanged writes
+HASH_CACHE_DIR = Path('.cache') / 'hashes'
+
+# pokedata.ovh conversions of previous decklists, reused for identical decklists for CONVERTED_DECKLIST_MAX_AGE seconds
+CONVERTED_DECKLIST_CACHE_DIR = Path('.cache') / 'converted'
+CONVERTED_DECKLIST_MAX_AGE = 30 * 24 * 60 * 60
+
+# Fingerprint of each set's cards as of its last generated page, used to skip rendering unchanged sets
+SET_FINGERPRINTS_FILE = Path('.cache') / 'set_fingerprints.json'
+
+# Each set's completion metrics from the last run, reused while the set's source files are unchanged
+SET_METRICS_CACHE_FILE = Path('.cache') / 'set_metrics.json'
+
+# Card fields with only a handful of distinct values, shared as one string object each after loading
+INTERNED_CARD_FIELDS = ('source', 'variant_type', 'set_code', 'set_name')
+
+# Shared HTTP session so requests to the converter reuse the same kept-alive connection, retrying
+# transient gateway errors (conversion has no side effects, so retrying the POST is safe)
+HTTP_SESSION = requests.Session()
+try:
+    HTTP_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                       allowed_methods=frozenset({'POST'}))
+except TypeError:
+    # urllib3 older than 1.26 only knows the option as method_whitelist
+    HTTP_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                       method_whitelist=frozenset({'POST'}))
+HTTP_SESSION.mount('https://', HTTPAdapter(max_retries=HTTP_RETRY))
+
+# The converted want list in the converter's response page
+TEXTAREA_PATTERN = re.compile(r'<textarea[^>]*id="cardmarket"[^>]*>(.*?)</textarea>', re.DOTALL)
+
+# Headers matching the working browser request to the pokedata.ovh converter
+POKEDATA_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64; rv:142.0) Gecko/20100101 Firefox/142.0',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-GB,en;q=0.5',
+    'Referer': 'https://www.pokedata.ovh/misc/cardmarket',
+    'Content-Type': 'application/x-www-form-urlencoded',
+    'Origin': 'https://www.pokedata.ovh',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'same-origin',
+    'Sec-Fetch-User': '?1',
+    'Pragma': 'no-cache',
+    'Cache-Control': 'no-cache'
+}
 
 def load_data(filename="card_data.json"):
     """Load extracted card data from JSON file"""
@@ -20,8 +81,199 @@ def load_data(filename="card_data.json"):
         print(f"Error: {filename} not found. Run extract_data.py first.")
         return None
 
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    if orjson is not None:
+        # orjson parses straight from the raw bytes, several times faster than json.load
+        data = orjson.loads(Path(filename).read_bytes())
+    else:
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    # json.load creates a new string for every value, so without this each card carries its own copies
+    for cards_key in ('tcg_cards', 'cardmarket_cards'):
+        for card in data.get(cards_key, []):
+            for field in INTERNED_CARD_FIELDS:
+                value = card.get(field)
+                if isinstance(value, str):
+                    card[field] = sys.intern(value)
+
+    return data
+
+def to_compact_json(obj):
+    """Serialize obj as compact JSON for embedding into generated pages"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+def file_content_hash(path, unhashed_prefix=None):
+    """Hash of a file's current content, or None if it can't be read"""
+    try:
+        if unhashed_prefix is None:
+            return blake2b(path.read_bytes(), digest_size=16).hexdigest()
+        # Leave out lines starting with unhashed_prefix, just as write_file_if_changed leaves out those chunks
+        hasher = blake2b(digest_size=16)
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.startswith(unhashed_prefix):
+                    hasher.update(line.encode('utf-8'))
+        return hasher.hexdigest()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def write_file_if_changed(path, content, unhashed_prefix=None):
+    """Write content (a string or an iterable of string chunks) to path unless it matches what's already there"""
+    path = Path(path)
+    hash_file = HASH_CACHE_DIR / f"{path.name}.hash"
+    previous_hash = None
+    if path.exists():
+        # Without a hash recorded on a previous run (e.g. .cache was cleared), compare against the file itself
+        previous_hash = hash_file.read_text() if hash_file.exists() else file_content_hash(path, unhashed_prefix)
+
+    if isinstance(content, str):
+        content_hash = blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        # Leave the file (and its mtime) alone if its content hasn't changed
+        changed = content_hash != previous_hash
+        if changed:
+            path.write_text(content, encoding='utf-8')
+    else:
+        # Stream the chunks to a temp file, hashing as we go, so the whole page is never held in memory.
+        # The temp file is per process, so concurrent runs can't interleave writes into one file
+        hasher = blake2b(digest_size=16)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for chunk in content:
+                # Chunks starting with unhashed_prefix (e.g. a generation timestamp) are written but don't count as a change;
+                # such a chunk must be exactly one line, so the file itself can be hashed the same way
+                if unhashed_prefix is None or not chunk.startswith(unhashed_prefix):
+                    hasher.update(chunk.encode('utf-8'))
+                f.write(chunk)
+        content_hash = hasher.hexdigest()
+        changed = content_hash != previous_hash
+        if changed:
+            os.replace(tmp_path, path)
+        else:
+            tmp_path.unlink()
+
+    if changed or not hash_file.exists():
+        HASH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        hash_file.write_text(content_hash)
+    return changed
+
+def write_output_files(outputs):
+    """Write (path, content) pairs concurrently and return {path: was_written}"""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = executor.map(lambda output: write_file_if_changed(*output), outputs)
+        return dict(zip((path for path, _ in outputs), results))
+
+def write_set_page(set_file, set_name, set_cards):
+    """Render one set page and write it if changed (top-level so worker processes can run it)"""
+    return write_file_if_changed(set_file, iter_individual_set_page(set_name, set_cards))
+
+def write_set_pages(set_pages):
+    """Render and write (path, set_name, set_cards) set pages, spread across worker processes, and return {path: was_written}"""
+    # Rendering rows is CPU-bound Python, so threads alone can't run pages in parallel
+    if len(set_pages) > 1 and (os.cpu_count() or 1) > 1:
+        # Some platforms/sandboxes can't start worker processes - render the pages here instead. Only a
+        # pool that can't start or loses its workers falls back; errors writing a page propagate as they are
+        try:
+            executor = ProcessPoolExecutor(max_workers=min(len(set_pages), os.cpu_count()))
+        except (OSError, NotImplementedError) as e:
+            print(f"Parallel set page generation unavailable ({e}), generating set pages sequentially")
+        else:
+            with executor:
+                try:
+                    # Workers are started as tasks are submitted
+                    futures = [executor.submit(write_set_page, *set_page) for set_page in set_pages]
+                except (OSError, BrokenProcessPool) as e:
+                    print(f"Parallel set page generation unavailable ({e}), generating set pages sequentially")
+                else:
+                    try:
+                        return {path: future.result() for (path, _, _), future in zip(set_pages, futures)}
+                    except BrokenProcessPool as e:
+                        print(f"Parallel set page generation failed ({e}), generating set pages sequentially")
+    return write_output_files([(path, iter_individual_set_page(set_name, set_cards)) for path, set_name, set_cards in set_pages])
+
+@lru_cache(maxsize=None)
+def set_page_renderer_hash():
+    """Hash of this module and the set page template, so fingerprints change whenever page rendering does"""
+    hasher = blake2b(Path(__file__).read_bytes(), digest_size=16)
+    hasher.update(Path('templates/set_page.html').read_bytes())
+    return hasher.hexdigest()
+
+def set_fingerprint(data, set_name, set_cards):
+    """Fingerprint of everything a set page is rendered from"""
+    hasher = blake2b(digest_size=16)
+    hasher.update(f"{set_page_renderer_hash()}:{set_name}:".encode('utf-8'))
+    # The set's source files (size/mtime) plus the extraction code decide its cards, so that key
+    # stands in for them; only data without recorded sources falls back to serializing every card
+    sources_key = set_sources_key(data, set_name)
+    if sources_key is not None:
+        hasher.update(sources_key.encode('utf-8'))
+    else:
+        hasher.update(json.dumps(set_cards, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+    return hasher.hexdigest()
+
+def load_set_fingerprints():
+    """Load the set fingerprints recorded on the last run"""
+    try:
+        with open(SET_FINGERPRINTS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_set_fingerprints(set_fingerprints):
+    """Record set fingerprints for the next run"""
+    SET_FINGERPRINTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(SET_FINGERPRINTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(set_fingerprints, f)
+
+@lru_cache(maxsize=None)
+def card_pipeline_hash():
+    """Hash of this module and extract_data.py, which together decide a set's cards and metrics"""
+    hasher = blake2b(Path(__file__).read_bytes(), digest_size=16)
+    hasher.update((Path(__file__).parent / 'extract_data.py').read_bytes())
+    return hasher.hexdigest()
+
+def set_sources_key(data, set_name):
+    """Key identifying the source files a set was extracted from, or None if they weren't recorded"""
+    set_source_files = data.get('source_files_by_set', {}).get(set_name)
+    if not set_source_files:
+        return None
+
+    source_files = data.get('source_files', {})
+    hasher = blake2b(f"{card_pipeline_hash()}:{set_name}".encode('utf-8'), digest_size=16)
+    for file_path in sorted(set_source_files):
+        file_info = source_files.get(file_path, {})
+        hasher.update(f":{file_path}:{file_info.get('size')}:{file_info.get('mtime')}".encode('utf-8'))
+    return hasher.hexdigest()
+
+def load_set_metrics(data, sets_by_name):
+    """Completion metrics for every set, reusing last run's for sets whose source files are unchanged"""
+    try:
+        with open(SET_METRICS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached_metrics = json.load(f)
+    except (OSError, ValueError):
+        cached_metrics = {}
+
+    set_metrics = {}
+    metrics_cache = {}
+    for set_name, cards in sets_by_name.items():
+        sources_key = set_sources_key(data, set_name)
+        cached = cached_metrics.get(set_name)
+        if sources_key is not None and cached is not None and cached[0] == sources_key:
+            metrics = cached[1]
+        else:
+            metrics = calculate_completion_metrics(cards)
+        set_metrics[set_name] = metrics
+        if sources_key is not None:
+            metrics_cache[set_name] = [sources_key, metrics]
+
+    # Only current sets are written back, so entries for removed sets don't pile up
+    if metrics_cache != cached_metrics:
+        SET_METRICS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(SET_METRICS_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(metrics_cache, f)
+
+    return set_metrics
 
 def get_sets_needing_regeneration(data, force_all=False):
     """Determine which sets need HTML regeneration based on source file changes"""
@@ -31,19 +283,41 @@ def get_sets_needing_regeneration(data, force_all=False):
     source_files = data.get('source_files', {})
     sets_to_regenerate = set()
 
+    # Which sets each source file fed at extraction time (missing from older card_data.json files)
+    sets_by_source_file = {}
+    for set_name, set_source_files in data.get('source_files_by_set', {}).items():
+        for file_path in set_source_files:
+            sets_by_source_file.setdefault(file_path, []).append(set_name)
+
+    # One listing of data/ gives every saved page's name and mtime, rather than separate
+    # exists/getmtime calls per source file plus a glob (hidden files are skipped, as glob does)
+    current_html_files = {}
+    try:
+        with os.scandir('data') as entries:
+            for entry in entries:
+                if not entry.name.startswith('.') and fnmatch.fnmatch(entry.name, '*.html'):
+                    current_html_files[os.path.join('data', entry.name)] = (entry.name, entry.stat().st_mtime)
+    except FileNotFoundError:
+        pass
+
     # Check if any source files have been modified since extraction
     for file_path, file_info in source_files.items():
-        if os.path.exists(file_path):
-            current_mtime = os.path.getmtime(file_path)
+        current_file = current_html_files.get(file_path)
+        if current_file:
+            file_name, current_mtime = current_file
             stored_mtime = file_info.get('mtime', 0)
 
             # If file was modified after extraction, find which sets it affects
             if current_mtime > stored_mtime:
-                file_name = os.path.basename(file_path)
                 print(f"File changed since extraction: {file_name}")
 
-                # Extract set name from TCG Collector filename patterns
-                if 'TCG Collector' in file_name:
+                if sets_by_source_file:
+                    for set_name in sets_by_source_file.get(file_path, ()):
+                        sets_to_regenerate.add(set_name)
+                        print(f"  -> Will regenerate set: {set_name}")
+
+                # Otherwise extract set name from TCG Collector filename patterns
+                elif 'TCG Collector' in file_name:
                     # Try to match common patterns like "Set Name card list (International TCG) – TCG Collector.html"
                     if 'card list' in file_name:
                         set_name = file_name.split(' card list')[0].strip()
@@ -52,9 +326,7 @@ def get_sets_needing_regeneration(data, force_all=False):
 
     # Also check if any HTML files exist that weren't in the original source files
     # (this handles newly added files)
-    current_html_files = set(glob.glob('data/*.html'))
-    tracked_files = set(source_files.keys())
-    new_files = current_html_files - tracked_files
+    new_files = current_html_files.keys() - source_files.keys()
 
     if new_files:
         print(f"Found {len(new_files)} new HTML files - will regenerate all sets")
@@ -62,48 +334,143 @@ def get_sets_needing_regeneration(data, force_all=False):
 
     return sets_to_regenerate
 
-def generate_individual_set_page(set_name, set_cards):
-    """Generate individual set page with detailed card list using templates"""
-    import html
+# {{NAME}} placeholders in the page templates
+TEMPLATE_PLACEHOLDER_PATTERN = re.compile(r'\{\{([A-Z_]+)\}\}')
+
+def compile_template(template_text):
+    """Split template text into literal text (even indexes) and placeholder names (odd indexes)"""
+    return TEMPLATE_PLACEHOLDER_PATTERN.split(template_text)
+
+def render_template(segments, values):
+    """Fill in a compiled template's placeholders in a single pass, leaving unknown ones as they are"""
+    return ''.join(
+        values.get(segment, f'{{{{{segment}}}}}') if i % 2 else segment
+        for i, segment in enumerate(segments)
+    )
+
+@lru_cache(maxsize=None)
+def load_set_page_template():
+    """Read the set page template once per run, returning its compiled head and the tail after the card rows"""
+    with open('templates/set_page.html', 'r', encoding='utf-8') as f:
+        html_template = f.read()
+
+    # Split the template around the card rows so rows can be streamed out one at a time
+    page_head, _, page_tail = html_template.partition('{{CARD_ROWS}}')
+    return compile_template(page_head), page_tail
+
+@lru_cache(maxsize=None)
+def load_overview_template():
+    """Read the overview page template once per run, returning it compiled"""
+    with open('templates/overview_page.html', 'r', encoding='utf-8') as f:
+        return compile_template(f.read())
+
+# Markup for one card row on a set page, filled in with str.format_map per card
+SET_PAGE_ROW_TEMPLATE = '''
+            <tr class="{row_class}">
+                <td>{camera_icon}</td>
+                <td>{number}</td>
+                <td>{total_count}</td>
+                <td>{name}</td>
+                <td>{variant}</td>
+                <td>{rarity}</td>
+                <td>{have}</td>
+                <td>{status}</td>
+            </tr>'''
+
+# Spaces become underscores and apostrophes/dots are dropped in set page file names ('&' is handled separately)
+SAFE_FILENAME_TABLE = str.maketrans({' ': '_', "'": None, '.': None})
+
+# Characters dropped from a set name to make its overview card's element id
+SET_ID_STRIP_PATTERN = re.compile(r'[^a-zA-Z0-9]')
+
+@lru_cache(maxsize=None)
+def safe_set_filename(set_name):
+    """File name (without .html) of a set's page"""
+    # '&' -> 'and' is multi-character, so it can't go in the translate table
+    return set_name.replace('&', 'and').translate(SAFE_FILENAME_TABLE)
+
+# Display order of variants within a card number on set pages
+VARIANT_ORDER = {'Normal': 0, 'Reverse Holo': 1, 'Holo': 2}
+
+# Sort position of card numbers that aren't plain digits, after every numbered card
+NON_NUMERIC_CARD_NUMBER = 10 ** 9
+
+def card_number_sort_key(number):
+    """Sort key putting card numbers in numeric order (so 1000 follows 999), with non-numeric ones last"""
+    return int(number) if number.isdecimal() else NON_NUMERIC_CARD_NUMBER
+
+# Characters html.escape rewrites; most card fields contain none of them
+HTML_SPECIAL_CHARS = re.compile(r'[&<>"\']')
+
+# Row values (rarity titles/icons, variant types, totals, numbers) repeat across many rows, so escape each once;
+# bounded so high-cardinality card names and ids can't grow it without limit
+@lru_cache(maxsize=4096)
+def escape_html(text):
+    """html.escape, returning text unchanged when it has nothing to escape"""
+    if HTML_SPECIAL_CHARS.search(text) is None:
+        return text
+    return html.escape(text)
+
+@lru_cache(maxsize=None)
+def card_status(has_card, pending):
+    """Return (have, status, row_class) for a card's ownership/pending state"""
+    have = '✓' if has_card else '✗'
+    if has_card:
+        if pending:
+            # Still color as owned since they have it
+            return have, 'Have + Pending Delivery (Duplicate!)', 'has-card'
+        return have, 'Have', 'has-card'
+    if pending:
+        return have, 'Pending Delivery', 'pending'
+    return have, 'Need', 'missing-card'
+
+def iter_individual_set_page(set_name, set_cards):
+    """Generate individual set page with detailed card list using templates, yielding it in chunks"""
+    # One pass over the cards counts owned/pending cards and builds the sort keys. Keys are computed
+    # once per card and compared via itemgetter, so sorting never calls back into Python per comparison.
+    # Card numbers sort numerically (so 1000 follows 999), with non-numeric ones after them by text
+    owned_cards = 0
+    pending_cards = 0
+    decorated = []
+    for card in set_cards:
+        get = card.get
+        has_card = bool(get('has_card'))
+        pending = bool(get('cardmarket_pending'))
+        owned_cards += has_card
+        pending_cards += pending
+        number = get('number') or ''
+        decorated.append((card_number_sort_key(number), number,
+                          VARIANT_ORDER.get(get('variant_type', 'Normal'), 99), has_card, pending, card))
 
     # Calculate set statistics
     total_cards = len(set_cards)
-    owned_cards = sum(1 for card in set_cards if card.get('has_card'))
-    pending_cards = sum(1 for card in set_cards if card.get('cardmarket_pending'))
     completion_percent = (owned_cards / total_cards * 100) if total_cards > 0 else 0
 
     # Get set code (assuming all cards in set have same code)
     set_code = set_cards[0].get('set_code', 'UNK') if set_cards else 'UNK'
 
-    # Load HTML template
-    with open('templates/set_page.html', 'r', encoding='utf-8') as f:
-        html_template = f.read()
-
-    # Load JavaScript template
-    with open('templates/cardmarket.js', 'r', encoding='utf-8') as f:
-        js_template = f.read()
-
-    # Generate card rows HTML
-    card_rows_html = ""
+    # Fill in the page header's placeholders in one pass over the template
+    page_head, page_tail = load_set_page_template()
+    yield render_template(page_head, {
+        'SET_NAME': escape_html(set_name),
+        'SET_CODE': escape_html(set_code),
+        'TOTAL_CARDS': str(total_cards),
+        'OWNED_CARDS': str(owned_cards),
+        'PENDING_CARDS': str(pending_cards),
+        'COMPLETION_PERCENT': f"{completion_percent:.1f}",
+    })
 
     # Sort cards by number and variant
-    def sort_key(card):
-        variant_order = {'Normal': 0, 'Reverse Holo': 1, 'Holo': 2}
-        variant_type = card.get('variant_type', 'Normal')
-        return (
-            card.get('number', ''),
-            variant_order.get(variant_type, 99)
-        )
+    decorated.sort(key=itemgetter(0, 1, 2))
 
-    sorted_cards = sorted(set_cards, key=sort_key)
-
-    for card in sorted_cards:
-        number = card.get('number', 'XXX')
-        total_count = card.get('total_count') or ''
-        name = card.get('name', 'Unknown')
-        variant = card.get('variant_type', 'Normal')
-        rarity_data = card.get('rarity_data')
-        card_id = card.get('card_id')
+    for _, _, _, has_card, pending, card in decorated:
+        get = card.get
+        number = get('number', 'XXX')
+        total_count = get('total_count') or ''
+        name = get('name', 'Unknown')
+        variant = get('variant_type', 'Normal')
+        rarity_data = get('rarity_data')
+        card_id = get('card_id')
 
         # Process rarity data into HTML
         rarity_html = ''
@@ -111,77 +478,61 @@ def generate_individual_set_page(set_name, set_cards):
             if isinstance(rarity_data, dict):
                 if 'src' in rarity_data and 'title' in rarity_data:
                     # Display image with alt text
-                    rarity_html = f'<img src="{html.escape(rarity_data["src"])}" alt="{html.escape(rarity_data["title"])}" title="{html.escape(rarity_data["title"])}" style="height: 16px; width: auto;">'
+                    rarity_html = f'<img src="{escape_html(rarity_data["src"])}" alt="{escape_html(rarity_data["title"])}" title="{escape_html(rarity_data["title"])}" style="height: 16px; width: auto;">'
                 elif 'text' in rarity_data:
                     # Fallback to text (for cases like energies that don't use images)
-                    rarity_html = html.escape(rarity_data['text'])
+                    rarity_html = escape_html(rarity_data['text'])
                 else:
                     rarity_html = 'Unknown'
             else:
                 # Handle legacy single string format (backward compatibility)
-                rarity_html = html.escape(str(rarity_data))
+                rarity_html = escape_html(str(rarity_data))
         else:
             rarity_html = 'Unknown'
 
         # Create camera icon HTML if card has an ID
         camera_icon_html = ''
         if card_id:
-            camera_icon_html = f'<span class="camera-icon" onmouseover="showCardPreview(event, \'{card_id}\')" onmouseout="hideCardPreview()">📷</span>'
-
-        have = '✓' if card.get('has_card') else '✗'
-
-        # Determine status
-        if card.get('has_card'):
-            if card.get('cardmarket_pending'):
-                status = 'Have + Pending Delivery (Duplicate!)'
-                row_class = 'has-card'  # Still color as owned since they have it
-            else:
-                status = 'Have'
-                row_class = 'has-card'
-        elif card.get('cardmarket_pending'):
-            status = 'Pending Delivery'
-            row_class = 'pending'
-        else:
-            status = 'Need'
-            row_class = 'missing-card'
-
-        card_rows_html += f'''
-            <tr class="{row_class}">
-                <td>{camera_icon_html}</td>
-                <td>{html.escape(number)}</td>
-                <td>{html.escape(total_count)}</td>
-                <td>{html.escape(name)}</td>
-                <td>{html.escape(variant)}</td>
-                <td>{rarity_html}</td>
-                <td>{have}</td>
-                <td>{status}</td>
-            </tr>'''
-
-    # Replace placeholders in JavaScript template
-    js_code = js_template.replace('{{SET_CODE}}', set_code)
-
-    # Calculate progress bar percentages
-    pending_percent = (pending_cards / total_cards * 100) if total_cards > 0 else 0
-    total_progress_percent = completion_percent + pending_percent
-
-    # Calculate percentages within the progress bar (owned vs pending)
-    owned_percent_of_total = (completion_percent / total_progress_percent * 100) if total_progress_percent > 0 else 0
-    pending_percent_of_total = (pending_percent / total_progress_percent * 100) if total_progress_percent > 0 else 0
+            # Hover handling is delegated from the table in report.js, so rows only carry the id
+            camera_icon_html = f'<span class="camera-icon" data-card-id="{escape_html(card_id)}">📷</span>'
+
+        # Only a handful of possible states, so this is a cache lookup per row
+        have, status, row_class = card_status(has_card, pending)
+
+        yield SET_PAGE_ROW_TEMPLATE.format_map({
+            'row_class': row_class,
+            'camera_icon': camera_icon_html,
+            'number': escape_html(number),
+            'total_count': escape_html(total_count),
+            'name': escape_html(name),
+            'variant': escape_html(variant),
+            'rarity': rarity_html,
+            'have': have,
+            'status': status,
+        })
+
+    yield page_tail
+
+def generate_report_assets():
+    """Build the static stylesheets and script the generated pages link to, keyed by output file name"""
+    with open('templates/report.css', 'r', encoding='utf-8') as f:
+        css_content = f.read()
+
+    # The page script and the Cardmarket want list script are served as one file
+    with open('templates/report.js', 'r', encoding='utf-8') as f:
+        js_content = f.read()
+    with open('templates/cardmarket.js', 'r', encoding='utf-8') as f:
+        js_content += '\n' + f.read() + '\n'
 
-    # Replace placeholders in HTML template
-    html_content = html_template.replace('{{SET_NAME}}', html.escape(set_name))
-    html_content = html_content.replace('{{SET_CODE}}', html.escape(set_code))
-    html_content = html_content.replace('{{TOTAL_CARDS}}', str(total_cards))
-    html_content = html_content.replace('{{OWNED_CARDS}}', str(owned_cards))
-    html_content = html_content.replace('{{PENDING_CARDS}}', str(pending_cards))
-    html_content = html_content.replace('{{COMPLETION_PERCENT}}', f"{completion_percent:.1f}")
-    html_content = html_content.replace('{{TOTAL_PROGRESS_PERCENT}}', f"{total_progress_percent:.1f}")
-    html_content = html_content.replace('{{OWNED_PERCENT_OF_TOTAL}}', f"{owned_percent_of_total:.1f}")
-    html_content = html_content.replace('{{PENDING_PERCENT_OF_TOTAL}}', f"{pending_percent_of_total:.1f}")
-    html_content = html_content.replace('{{CARD_ROWS}}', card_rows_html)
-    html_content = html_content.replace('{{CARDMARKET_JS}}', js_code)
+    # The overview page has its own stylesheet
+    with open('templates/overview.css', 'r', encoding='utf-8') as f:
+        overview_css_content = f.read()
 
-    return html_content
+    return {
+        'report.css': css_content,
+        'report.js': js_content,
+        'overview.css': overview_css_content,
+    }
 
 def calculate_completion_metrics(cards):
     """Calculate various completion metrics for a set of cards"""
@@ -205,6 +556,22 @@ def calculate_completion_metrics(cards):
         # Fallback: assume all cards are standard if no total_count available
         total_count = float('inf')
 
+    # Count cards per (standard, variant, owned, pending) class in one pass;
+    # there are only a handful of distinct classes, so the buckets below are
+    # filled from the counts instead of once per card
+    card_classes = Counter()
+    for card in cards:
+        get = card.get
+        try:
+            card_number = int(get('number', '0'))
+        except (ValueError, TypeError):
+            card_number = 0
+
+        card_classes[(card_number <= total_count,
+                      get('variant_type', 'Normal'),
+                      bool(get('has_card', False)),
+                      bool(get('cardmarket_pending', False)))] += 1
+
     # Initialize metrics
     metrics = {
         'all_cards': {'total': 0, 'owned': 0, 'pending': 0},
@@ -214,78 +581,42 @@ def calculate_completion_metrics(cards):
         'secret_cards': {'total': 0, 'owned': 0, 'pending': 0}
     }
 
-    # Analyze each card
-    for card in cards:
-        is_owned = card.get('has_card', False)
-        is_pending = card.get('cardmarket_pending', False)
-        variant_type = card.get('variant_type', 'Normal')
-
-        try:
-            card_number = int(card.get('number', '0'))
-        except (ValueError, TypeError):
-            card_number = 0
-
-        is_standard = card_number <= total_count
-        is_secret = card_number > total_count
-        is_normal = variant_type == 'Normal'
-        is_reverse = variant_type == 'Reverse Holo'
-
-        # All cards
-        metrics['all_cards']['total'] += 1
-        if is_owned:
-            metrics['all_cards']['owned'] += 1
-        if is_pending:
-            metrics['all_cards']['pending'] += 1
-
-        # Standard set (all variants)
+    for (is_standard, variant_type, is_owned, is_pending), count in card_classes.items():
+        buckets = [metrics['all_cards']]
         if is_standard:
-            metrics['standard_set']['total'] += 1
-            if is_owned:
-                metrics['standard_set']['owned'] += 1
-            if is_pending:
-                metrics['standard_set']['pending'] += 1
-
-        # Standard set - Normal variants only
-        if is_standard and is_normal:
-            metrics['standard_normal']['total'] += 1
-            if is_owned:
-                metrics['standard_normal']['owned'] += 1
-            if is_pending:
-                metrics['standard_normal']['pending'] += 1
-
-        # Standard set - Reverse Holo variants only
-        if is_standard and is_reverse:
-            metrics['standard_reverse']['total'] += 1
-            if is_owned:
-                metrics['standard_reverse']['owned'] += 1
-            if is_pending:
-                metrics['standard_reverse']['pending'] += 1
+            # Standard set (all variants), plus the Normal / Reverse Holo splits
+            buckets.append(metrics['standard_set'])
+            if variant_type == 'Normal':
+                buckets.append(metrics['standard_normal'])
+            elif variant_type == 'Reverse Holo':
+                buckets.append(metrics['standard_reverse'])
+        else:
+            # Secret cards
+            buckets.append(metrics['secret_cards'])
 
-        # Secret cards
-        if is_secret:
-            metrics['secret_cards']['total'] += 1
+        for bucket in buckets:
+            bucket['total'] += count
             if is_owned:
-                metrics['secret_cards']['owned'] += 1
+                bucket['owned'] += count
             if is_pending:
-                metrics['secret_cards']['pending'] += 1
+                bucket['pending'] += count
 
     return metrics
 
-def generate_set_overview_page(all_cards):
-    """Generate the main overview page with all sets"""
-    # Group cards by set
-    sets_by_name = {}
+def group_cards_by_set(all_cards):
+    """Group processed cards into lists by set name, in first-seen order"""
+    sets_by_name = defaultdict(list)
     for card in all_cards.values():
-        set_name = card.get('set_name', 'Unknown')
-        if set_name not in sets_by_name:
-            sets_by_name[set_name] = []
-        sets_by_name[set_name].append(card)
+        sets_by_name[card.get('set_name', 'Unknown')].append(card)
+    return sets_by_name
 
+def generate_set_overview_page(sets_by_name, set_metrics=None):
+    """Generate the main overview page with all sets (cards grouped by group_cards_by_set, metrics from load_set_metrics)"""
     # Calculate set-specific statistics with enhanced metrics first
     set_stats = {}
     for set_name, cards in sets_by_name.items():
         set_code = cards[0].get('set_code', 'UNK') if cards else 'UNK'
-        metrics = calculate_completion_metrics(cards)
+        metrics = set_metrics[set_name] if set_metrics is not None else calculate_completion_metrics(cards)
 
         set_stats[set_name] = {
             'set_code': set_code,
@@ -307,291 +638,48 @@ def generate_set_overview_page(all_cards):
             overall_metrics[metric_type]['owned'] += set_data['metrics'][metric_type]['owned']
             overall_metrics[metric_type]['pending'] += set_data['metrics'][metric_type]['pending']
 
-    html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>Pokemon Card Collection Overview</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-        h1 {{ color: #333; text-align: center; }}
-        h2 {{ color: #666; border-bottom: 2px solid #007bff; padding-bottom: 10px; }}
-        .overview-stats {{
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }}
-        .set-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-            gap: 20px;
-        }}
-        .set-card {{
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-            transition: transform 0.2s ease;
-        }}
-        .set-card:hover {{ transform: translateY(-2px); box-shadow: 0 4px 10px rgba(0,0,0,0.2); }}
-        .set-title {{ font-size: 18px; font-weight: bold; color: #333; margin-bottom: 5px; }}
-        .set-code {{ color: #666; font-size: 14px; margin-bottom: 15px; }}
-        .progress-bar {{
-            width: 100%;
-            height: 20px;
-            background-color: #e9ecef;
-            border-radius: 10px;
-            overflow: hidden;
-            margin: 10px 0;
-        }}
-        .progress-fill {{
-            height: 100%;
-            display: flex;
-            transition: width 0.3s ease;
-        }}
-        .progress-owned {{
-            background: linear-gradient(90deg, #28a745 0%, #20c997 100%);
-        }}
-        .progress-pending {{
-            background: linear-gradient(90deg, #6c757d 0%, #495057 100%);
-        }}
-        .set-stats {{ font-size: 14px; color: #666; }}
-        .set-link {{
-            display: inline-block;
-            margin-top: 15px;
-            padding: 8px 16px;
-            background-color: #007bff;
-            color: white;
-            text-decoration: none;
-            border-radius: 5px;
-            font-size: 14px;
-        }}
-        .set-link:hover {{ background-color: #0056b3; }}
-        .overall-stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }}
-        .stat-box {{ text-align: center; padding: 15px; background: white; border-radius: 8px; }}
-        .stat-number {{ font-size: 24px; font-weight: bold; color: #007bff; }}
-        .stat-label {{ font-size: 14px; color: #666; }}
-        .metric-selector {{
-            background: white;
-            padding: 15px 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-            display: flex;
-            align-items: center;
-            gap: 15px;
-        }}
-        .metric-selector label {{
-            font-weight: bold;
-            color: #333;
-            font-size: 16px;
-        }}
-        .metric-selector select {{
-            padding: 8px 12px;
-            font-size: 14px;
-            border: 2px solid #ddd;
-            border-radius: 5px;
-            background: white;
-            min-width: 250px;
-        }}
-        .metric-selector select:focus {{
-            outline: none;
-            border-color: #007bff;
-        }}
-        .metric-description {{
-            color: #666;
-            font-size: 14px;
-            font-style: italic;
-            margin-left: auto;
-        }}
-    </style>
-    <script>
-        // Store all metrics data for dynamic switching
-        const overallMetrics = PLACEHOLDER_OVERALL_METRICS;
-        const setMetrics = PLACEHOLDER_SET_METRICS;
-
-        // Current metric selection
-        let currentMetric = 'all_cards';
-
-        // Descriptions for each metric
-        const metricDescriptions = {{
-            'all_cards': 'All cards including secret cards and both variants',
-            'standard_set': 'Cards #1 to set limit, both Normal and Reverse Holo',
-            'standard_normal': 'Standard set cards, Normal variant only',
-            'standard_reverse': 'Alternate set cards, Reverse Holo variant only',
-            'secret_cards': 'Standard set secret cards (numbered above set limit)'
-        }};
-
-        function updateMetricView() {{
-            const selector = document.getElementById('metricSelector');
-            currentMetric = selector.value;
-
-            // Update description
-            document.getElementById('metricDescription').textContent = metricDescriptions[currentMetric];
-
-            // Update overall statistics
-            updateOverallStats();
-
-            // Update all set cards
-            updateSetCards();
-        }}
-
-        function updateOverallStats() {{
-            const metrics = overallMetrics[currentMetric];
-
-            document.getElementById('totalCards').textContent = metrics.total;
-            document.getElementById('totalOwned').textContent = metrics.owned;
-            document.getElementById('totalPending').textContent = metrics.pending;
-
-            const completionPercent = metrics.total > 0 ? (metrics.owned / metrics.total * 100).toFixed(1) : 0;
-            document.getElementById('completionPercent').textContent = completionPercent + '%';
-        }}
-
-        function updateSetCards() {{
-            // Collect all set data with their metrics and DOM elements
-            const setData = [];
-
-            for (const [setName, stats] of Object.entries(setMetrics)) {{
-                const metrics = stats.metrics[currentMetric];
-                const setCard = document.getElementById('set-' + setName.replace(/[^a-zA-Z0-9]/g, ''));
-
-                if (!setCard) continue;
-
-                const completionPercent = metrics.total > 0 ? (metrics.owned / metrics.total * 100) : 0;
-                const pendingPercent = metrics.total > 0 ? (metrics.pending / metrics.total * 100) : 0;
-                const totalPercent = completionPercent + pendingPercent;
-
-                setData.push({{
-                    setName: setName,
-                    metrics: metrics,
-                    completionPercent: completionPercent,
-                    pendingPercent: pendingPercent,
-                    totalPercent: totalPercent,
-                    element: setCard
-                }});
-            }}
-
-            // Sort by completion percentage (descending), then by set name (alphabetically)
-            setData.sort((a, b) => {{
-                if (b.completionPercent !== a.completionPercent) {{
-                    return b.completionPercent - a.completionPercent;
-                }}
-                return a.setName.localeCompare(b.setName);
-            }});
-
-            // Reorder DOM elements
-            const setGrid = document.querySelector('.set-grid');
-            setData.forEach(data => {{
-                setGrid.appendChild(data.element);
-            }});
-
-            // Update each card's content
-            setData.forEach(data => {{
-                const setCard = data.element;
-                const metrics = data.metrics;
-                const completionPercent = data.completionPercent;
-                const pendingPercent = data.pendingPercent;
-                const totalPercent = data.totalPercent;
-
-                // Update progress bar
-                const progressFill = setCard.querySelector('.progress-fill');
-                const progressOwned = setCard.querySelector('.progress-owned');
-                const progressPending = setCard.querySelector('.progress-pending');
-
-                progressFill.style.width = totalPercent + '%';
-
-                if (totalPercent > 0) {{
-                    progressOwned.style.width = (completionPercent / totalPercent * 100) + '%';
-                    progressPending.style.width = (pendingPercent / totalPercent * 100) + '%';
-                }} else {{
-                    progressOwned.style.width = '0%';
-                    progressPending.style.width = '0%';
-                }}
-
-                // Update statistics text
-                const statsDiv = setCard.querySelector('.set-stats');
-                let statsText = `<strong>${{metrics.owned}}</strong> of <strong>${{metrics.total}}</strong> cards owned (<strong>${{completionPercent.toFixed(1)}}%</strong> complete)`;
-
-                if (metrics.pending > 0) {{
-                    statsText += `<br><strong>${{metrics.pending}}</strong> cards pending delivery (${{pendingPercent.toFixed(1)}}%)`;
-                }}
-
-                statsDiv.innerHTML = statsText;
-            }});
-        }}
-
-        // Initialize on page load
-        document.addEventListener('DOMContentLoaded', function() {{
-            updateMetricView();
-        }});
-    </script>
-</head>
-<body>
-    <h1>Pokemon Card Collection Overview</h1>
-
-    <div class="metric-selector">
-        <label for="metricSelector">View Mode:</label>
-        <select id="metricSelector" onchange="updateMetricView()">
-            <option value="all_cards">All Cards</option>
-            <option value="standard_set">Standard Set</option>
-            <option value="standard_normal">Standard Set - Normal Only</option>
-            <option value="standard_reverse">Alternate Set - Reverse Holos Only</option>
-            <option value="secret_cards">Standard Set - Secret Cards Only</option>
-        </select>
-        <div id="metricDescription" class="metric-description">All cards including secret cards and both variants</div>
-    </div>
-
-    <div class="overview-stats">
-        <h2>Overall Collection Statistics</h2>
-        <div class="overall-stats">
-            <div class="stat-box">
-                <div id="totalCards" class="stat-number">0</div>
-                <div class="stat-label">Total Cards Tracked</div>
-            </div>
-            <div class="stat-box">
-                <div id="totalOwned" class="stat-number">0</div>
-                <div class="stat-label">Cards Owned</div>
-            </div>
-            <div class="stat-box">
-                <div id="totalPending" class="stat-number">0</div>
-                <div class="stat-label">Pending Delivery</div>
-            </div>
-            <div class="stat-box">
-                <div id="completionPercent" class="stat-number">0%</div>
-                <div class="stat-label">Collection Complete</div>
-            </div>
-        </div>
-    </div>
+    # Serialize the metrics for the page's script once, to be filled into the template's placeholders
+    overall_metrics_json = to_compact_json(overall_metrics)
+    set_metrics_json = to_compact_json(set_stats)
 
-    <h2>Sets</h2>
-    <div class="set-grid">"""
+    # Work out each set's all_cards percentages once (used for initial display, updated by JavaScript)
+    # and its (owned + pending) / total completion ratio, which the sets are sorted on
+    set_rows = []
+    for set_name, stats in set_stats.items():
+        metrics = stats['metrics']['all_cards']
+        total = metrics['total']
+        if total > 0:
+            completion_percent = metrics['owned'] / total * 100
+            pending_percent = metrics['pending'] / total * 100
+            ratio = (metrics['owned'] + metrics['pending']) / total
+        else:
+            completion_percent = pending_percent = ratio = 0
+        set_rows.append((set_name, stats, metrics, completion_percent, pending_percent, ratio))
 
-    # Sort sets by all_cards completion percentage (owned + pending) / total (descending)
-    sorted_sets = sorted(set_stats.items(),
-                        key=lambda x: (x[1]['metrics']['all_cards']['owned'] + x[1]['metrics']['all_cards']['pending']) / x[1]['metrics']['all_cards']['total']
-                        if x[1]['metrics']['all_cards']['total'] > 0 else 0,
-                        reverse=True)
+    # Sort sets by completion ratio (descending)
+    set_rows.sort(key=itemgetter(5), reverse=True)
 
-    for set_name, stats in sorted_sets:
-        # Use all_cards metrics for initial display (will be updated by JavaScript)
-        metrics = stats['metrics']['all_cards']
-        completion_percent = (metrics['owned'] / metrics['total'] * 100) if metrics['total'] > 0 else 0
-        pending_percent = (metrics['pending'] / metrics['total'] * 100) if metrics['total'] > 0 else 0
+    # Collect the set cards in parts and join once at the end rather than growing one string
+    set_card_parts = []
+    for set_name, stats, metrics, completion_percent, pending_percent, _ in set_rows:
+        # Split the filled part of the progress bar between owned and pending cards
+        total_progress = completion_percent + pending_percent
+        owned_ratio = (completion_percent / total_progress * 100) if total_progress > 0 else 0
+        pending_ratio = (pending_percent / total_progress * 100) if total_progress > 0 else 0
 
         # Create safe filename and ID for set
-        safe_filename = set_name.replace(' ', '_').replace('&', 'and').replace("'", "").replace('.', '')
-        safe_id = re.sub(r'[^a-zA-Z0-9]', '', set_name)  # Remove all non-alphanumeric chars for ID
+        safe_filename = safe_set_filename(set_name)
+        safe_id = SET_ID_STRIP_PATTERN.sub('', set_name)  # Remove all non-alphanumeric chars for ID
 
-        html_content += f"""
-        <div class="set-card" id="set-{safe_id}">
-            <div class="set-title">{html.escape(set_name)}</div>
-            <div class="set-code">Set Code: {html.escape(stats['set_code'])}</div>
+        set_card_parts.append(f"""
+        <div class="set-card" id="set-{safe_id}" data-set-name="{escape_html(set_name)}">
+            <div class="set-title">{escape_html(set_name)}</div>
+            <div class="set-code">Set Code: {escape_html(stats['set_code'])}</div>
 
             <div class="progress-bar">
-                <div class="progress-fill" style="width: {completion_percent + pending_percent}%">
-                    <div class="progress-owned" style="width: {(completion_percent / (completion_percent + pending_percent) * 100) if (completion_percent + pending_percent) > 0 else 0}%"></div>
-                    <div class="progress-pending" style="width: {(pending_percent / (completion_percent + pending_percent) * 100) if (completion_percent + pending_percent) > 0 else 0}%"></div>
+                <div class="progress-fill" style="width: {total_progress}%">
+                    <div class="progress-owned" style="width: {owned_ratio}%"></div>
+                    <div class="progress-pending" style="width: {pending_ratio}%"></div>
                 </div>
             </div>
 
@@ -602,54 +690,28 @@ def generate_set_overview_page(all_cards):
             </div>
 
             <a href="{safe_filename}.html" class="set-link">View Set Details →</a>
-        </div>"""
-
-    html_content += """
-    </div>
-</body>
-</html>"""
-
-    # Inject the actual data into JavaScript placeholders
-    html_content = html_content.replace('PLACEHOLDER_OVERALL_METRICS', json.dumps(overall_metrics))
-    html_content = html_content.replace('PLACEHOLDER_SET_METRICS', json.dumps(set_stats))
+        </div>""")
 
-    return html_content
+    return render_template(load_overview_template(), {
+        'OVERALL_METRICS': overall_metrics_json,
+        'SET_METRICS': set_metrics_json,
+        'SET_CARDS': ''.join(set_card_parts),
+    })
 
 def convert_decklist_to_cardmarket(decklist_text):
     """Convert decklist format to Cardmarket format using pokedata.ovh API"""
     try:
-        # Prepare the POST data
-        post_data = f"decklist={quote(decklist_text)}"
-
-        # Headers matching the working browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64; rv:142.0) Gecko/20100101 Firefox/142.0',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-GB,en;q=0.5',
-            'Referer': 'https://www.pokedata.ovh/misc/cardmarket',
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'Origin': 'https://www.pokedata.ovh',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'same-origin',
-            'Sec-Fetch-User': '?1',
-            'Pragma': 'no-cache',
-            'Cache-Control': 'no-cache'
-        }
-
-        # Make the request
-        response = requests.post(
+        # Make the request (requests form-encodes the decklist field itself)
+        response = HTTP_SESSION.post(
             'https://www.pokedata.ovh/misc/cardmarket',
-            data=post_data,
-            headers=headers,
+            data={'decklist': decklist_text},
+            headers=POKEDATA_HEADERS,
             timeout=30
         )
 
         if response.status_code == 200:
             # Extract the converted text from the textarea
-            import re
-            textarea_pattern = r'<textarea[^>]*id="cardmarket"[^>]*>(.*?)</textarea>'
-            match = re.search(textarea_pattern, response.text, re.DOTALL)
+            match = TEXTAREA_PATTERN.search(response.text)
             if match:
                 converted_text = match.group(1).strip()
                 return converted_text
@@ -664,167 +726,169 @@ def convert_decklist_to_cardmarket(decklist_text):
         print(f"Warning: Failed to convert decklist: {e}")
         return None
 
-def generate_want_lists(all_cards):
-    """Generate want lists in various formats for cards that are needed"""
+def convert_decklist_cached(decklist_text):
+    """convert_decklist_to_cardmarket, reusing a recent conversion of the same decklist instead of posting it again"""
+    cache_file = CONVERTED_DECKLIST_CACHE_DIR / f"{blake2b(decklist_text.encode('utf-8'), digest_size=16).hexdigest()}.txt"
+    try:
+        if datetime.now().timestamp() - cache_file.stat().st_mtime < CONVERTED_DECKLIST_MAX_AGE:
+            print("Using cached pokedata.ovh conversion (decklist unchanged)")
+            return cache_file.read_text(encoding='utf-8')
+    except OSError:
+        pass
+
+    converted_text = convert_decklist_to_cardmarket(decklist_text)
 
-    # Group cards by set and filter for cards you don't have and aren't pending
+    # Only successful conversions are kept, so a failed request is retried next run
+    if converted_text:
+        CONVERTED_DECKLIST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(converted_text, encoding='utf-8')
+        os.replace(tmp_file, cache_file)
+    return converted_text
+
+def generate_want_lists(sets_by_name, generated_at):
+    """Generate want lists in various formats for cards that are needed (cards grouped by group_cards_by_set)"""
+
+    # Filter each set's cards down to the ones you don't have and aren't pending
     want_lists = {}
-    for card in all_cards.values():
-        if not card.get('has_card') and not card.get('cardmarket_pending'):
-            set_name = card.get('set_name', 'Unknown Set')
-            if set_name not in want_lists:
-                want_lists[set_name] = []
-            want_lists[set_name].append(card)
+    for set_name, cards in sets_by_name.items():
+        wanted = [card for card in cards if not card.get('has_card') and not card.get('cardmarket_pending')]
+        if wanted:
+            want_lists[set_name] = wanted
+    total_cards = sum(len(cards) for cards in want_lists.values())
+
+    # The decklist and auto-converted formats are built from the same sorted decklist, so make it once
+    decklist = build_decklist(want_lists)
 
     # Generate different format files
     formats = {
-        'simple': generate_simple_want_list,
-        'cardmarket': generate_cardmarket_want_list,
-        'decklist': generate_decklist_want_list,
-        'cardmarket_converted': generate_cardmarket_converted_want_list
+        'simple': iter_simple_want_list,
+        'cardmarket': iter_cardmarket_want_list,
+        'decklist': lambda want_lists, generated_at: iter_decklist_want_list(want_lists, generated_at, decklist),
+        'cardmarket_converted': lambda want_lists, generated_at: iter_cardmarket_converted_want_list(want_lists, generated_at, decklist)
     }
 
     for format_name, generator_func in formats.items():
         filename = f"want_list_{format_name}.txt"
-        content = generator_func(want_lists)
-
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        total_cards = sum(len(cards) for cards in want_lists.values())
-        print(f"Want list generated: {filename} ({total_cards} cards)")
-
-def generate_simple_want_list(want_lists):
-    """Generate a simple list of card names by set"""
-    content = "# Pokemon Card Want List (Simple Format)\n"
-    content += f"# Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        # Each format yields its text in pieces, which are streamed straight to the file. The
+        # "Generated on" line differs every run, so it's left out when deciding if the list changed
+        written = write_file_if_changed(filename, generator_func(want_lists, generated_at), unhashed_prefix='# Generated on ')
+        print(f"Want list {'generated' if written else 'unchanged'}: {filename} ({total_cards} cards)")
+
+@lru_cache(maxsize=None)
+def variant_suffix(variant):
+    """Text following a card's name in want lists: ' (Variant)', or nothing for Normal cards"""
+    return '' if variant == 'Normal' else f" ({variant})"
+
+def iter_simple_want_list(want_lists, generated_at):
+    """Generate a simple list of card names by set, yielding it in chunks"""
+    yield "# Pokemon Card Want List (Simple Format)\n"
+    yield f"# Generated on {generated_at}\n"
+    yield "\n"
 
     for set_name, cards in sorted(want_lists.items()):
         if not cards:
             continue
 
-        content += f"## {set_name}\n"
-        for card in sorted(cards, key=lambda x: (x.get('number', '999'), x.get('name', ''))):
-            number = card.get('number', '???')
-            name = card.get('name', 'Unknown')
-            variant = card.get('variant_type', 'Normal')
-            if variant != 'Normal':
-                content += f"{number} {name} ({variant})\n"
-            else:
-                content += f"{number} {name}\n"
-        content += "\n"
-
-    return content
-
-def generate_cardmarket_want_list(want_lists):
-    """Generate a list formatted for Cardmarket import (best guess format)"""
-    content = "# Pokemon Card Want List (Cardmarket Format)\n"
-    content += f"# Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    content += "# Format: Card Name [Set Code] (modify abilities manually if needed)\n\n"
+        # Build each line with its sort key in one pass: card number (numerically), then name
+        decorated = []
+        for card in cards:
+            get = card.get
+            sort_number = get('number') or ''
+            line = f"{get('number', '???')} {get('name', 'Unknown')}{variant_suffix(get('variant_type', 'Normal'))}\n"
+            decorated.append((card_number_sort_key(sort_number), sort_number, get('name', ''), line))
+        decorated.sort(key=itemgetter(0, 1, 2))
+
+        yield f"## {set_name}\n"
+        yield from (line for _, _, _, line in decorated)
+        yield "\n"
+
+def iter_cardmarket_want_list(want_lists, generated_at):
+    """Generate a list formatted for Cardmarket import (best guess format), yielding it in chunks"""
+    yield "# Pokemon Card Want List (Cardmarket Format)\n"
+    yield f"# Generated on {generated_at}\n"
+    yield "# Format: Card Name [Set Code] (modify abilities manually if needed)\n\n"
 
     all_cards = []
     for set_name, cards in want_lists.items():
         for card in cards:
-            set_code = card.get('set_code', 'UNK')
-            name = card.get('name', 'Unknown')
-            variant = card.get('variant_type', 'Normal')
+            get = card.get
+            set_code = get('set_code', 'UNK')
+            name = get('name', 'Unknown')
 
             # Format for Cardmarket - this is a best guess
-            if variant != 'Normal':
-                formatted_name = f"{name} ({variant}) [{set_code}]"
-            else:
-                formatted_name = f"{name} [{set_code}]"
+            formatted_name = f"{name}{variant_suffix(get('variant_type', 'Normal'))} [{set_code}]"
 
             all_cards.append((name, formatted_name, card))
 
     # Sort alphabetically by card name
-    for name, formatted_name, card in sorted(all_cards, key=lambda x: x[0]):
-        content += f"{formatted_name}\n"
-
-    content += "\n# Note: You may need to manually add abilities in brackets like:\n"
-    content += "# Exeggcute [Precocious Evolution] [SSP]\n"
-    content += "# Durant ex [Sudden Shearing | Vengeful Crush] [SSP]\n"
-
-    return content
-
-def generate_decklist_want_list(want_lists):
-    """Generate a list in decklist format for pokedata.ovh converter"""
-    content = "# Pokemon Card Want List (Decklist Format for pokedata.ovh)\n"
-    content += f"# Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    content += "# Format: 1 CardName SetCode Number\n"
-    content += "# Use this with https://www.pokedata.ovh/misc/cardmarket\n\n"
-
-    # Collect all cards and sort them by set and number
-    all_want_cards = []
-    for set_name, cards in want_lists.items():
+    for name, formatted_name, card in sorted(all_cards, key=itemgetter(0)):
+        yield f"{formatted_name}\n"
+
+    yield "\n# Note: You may need to manually add abilities in brackets like:\n"
+    yield "# Exeggcute [Precocious Evolution] [SSP]\n"
+    yield "# Durant ex [Sudden Shearing | Vengeful Crush] [SSP]\n"
+
+def build_decklist(want_lists):
+    """Decklist text ("1 CardName SetCode Number" per line) for every wanted card, sorted by set code and number"""
+    # One pass reads each card's fields once, building both its line and its sort key:
+    # set code, then card number (numerically), then name
+    decorated = []
+    for cards in want_lists.values():
         for card in cards:
-            all_want_cards.append(card)
-
-    # Sort by set code, then by number
-    sorted_cards = sorted(all_want_cards, key=lambda x: (x.get('set_code', 'ZZZ'), int(x.get('number', '999')) if x.get('number', '999').isdigit() else 999, x.get('name', '')))
-
-    for card in sorted_cards:
-        number = card.get('number', '???')
-        name = card.get('name', 'Unknown')
-        set_code = card.get('set_code', 'UNK')
-        variant = card.get('variant_type', 'Normal')
+            get = card.get
+            number = get('number', '???')
+            name = get('name', 'Unknown')
+            set_code = get('set_code', 'UNK')
 
-        # Format exactly as the converter expects: "1 CardName SetCode Number"
-        if variant != 'Normal':
-            content += f"1 {name} ({variant}) {set_code} {number}\n"
-        else:
-            content += f"1 {name} {set_code} {number}\n"
+            # Format exactly as the converter expects: "1 CardName SetCode Number"
+            line = f"1 {name}{variant_suffix(get('variant_type', 'Normal'))} {set_code} {number}\n"
 
-    content += "\n# Instructions:\n"
-    content += "# 1. Copy the list above\n"
-    content += "# 2. Paste into https://www.pokedata.ovh/misc/cardmarket\n"
-    content += "# 3. Click Convert to get Cardmarket format with abilities\n"
+            decorated.append((get('set_code', 'ZZZ'), card_number_sort_key(get('number') or ''), get('name', ''), line))
 
-    return content
+    decorated.sort(key=itemgetter(0, 1, 2))
+    return ''.join(line for _, _, _, line in decorated)
 
-def generate_cardmarket_converted_want_list(want_lists):
-    """Generate a list automatically converted via pokedata.ovh API"""
-    content = "# Pokemon Card Want List (Auto-Converted via pokedata.ovh)\n"
-    content += f"# Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    content += "# Automatically converted with abilities included!\n\n"
+def iter_decklist_want_list(want_lists, generated_at, decklist=None):
+    """Generate a list in decklist format for pokedata.ovh converter, yielding it in chunks"""
+    if decklist is None:
+        decklist = build_decklist(want_lists)
 
-    # First generate the decklist format
-    decklist_content = ""
-    all_want_cards = []
-    for set_name, cards in want_lists.items():
-        for card in cards:
-            all_want_cards.append(card)
+    yield "# Pokemon Card Want List (Decklist Format for pokedata.ovh)\n"
+    yield f"# Generated on {generated_at}\n"
+    yield "# Format: 1 CardName SetCode Number\n"
+    yield "# Use this with https://www.pokedata.ovh/misc/cardmarket\n\n"
+    yield decklist
 
-    # Sort by set code, then by number (same as decklist format)
-    sorted_cards = sorted(all_want_cards, key=lambda x: (x.get('set_code', 'ZZZ'), int(x.get('number', '999')) if x.get('number', '999').isdigit() else 999, x.get('name', '')))
+    yield "\n# Instructions:\n"
+    yield "# 1. Copy the list above\n"
+    yield "# 2. Paste into https://www.pokedata.ovh/misc/cardmarket\n"
+    yield "# 3. Click Convert to get Cardmarket format with abilities\n"
 
-    for card in sorted_cards:
-        number = card.get('number', '???')
-        name = card.get('name', 'Unknown')
-        set_code = card.get('set_code', 'UNK')
-        variant = card.get('variant_type', 'Normal')
+def iter_cardmarket_converted_want_list(want_lists, generated_at, decklist=None):
+    """Generate a list automatically converted via pokedata.ovh API, yielding it in chunks"""
+    yield "# Pokemon Card Want List (Auto-Converted via pokedata.ovh)\n"
+    yield f"# Generated on {generated_at}\n"
+    yield "# Automatically converted with abilities included!\n\n"
 
-        # Format exactly as the converter expects: "1 CardName SetCode Number"
-        if variant != 'Normal':
-            decklist_content += f"1 {name} ({variant}) {set_code} {number}\n"
-        else:
-            decklist_content += f"1 {name} {set_code} {number}\n"
+    # First generate the decklist format (same as the decklist want list)
+    decklist_content = decklist if decklist is not None else build_decklist(want_lists)
 
-    # Try to convert via the API
+    # Try to convert via the API (or reuse a recent conversion of the same decklist)
     print("Converting decklist to Cardmarket format via pokedata.ovh...")
-    converted_text = convert_decklist_to_cardmarket(decklist_content)
+    converted_text = convert_decklist_cached(decklist_content)
 
     if converted_text:
-        content += "# SUCCESS: Automatically converted with abilities!\n"
-        content += "# Copy the text below and paste directly into Cardmarket:\n\n"
-        content += converted_text
-        content += "\n\n# Note: This was automatically converted - abilities are included!"
+        yield "# SUCCESS: Automatically converted with abilities!\n"
+        yield "# Copy the text below and paste directly into Cardmarket:\n\n"
+        yield converted_text
+        yield "\n\n# Note: This was automatically converted - abilities are included!"
     else:
-        content += "# CONVERSION FAILED: Using manual format instead\n"
-        content += "# You may need to manually add abilities or try the pokedata.ovh converter\n\n"
-        content += "# Original decklist format (copy to https://www.pokedata.ovh/misc/cardmarket):\n"
-        content += decklist_content
-        content += "\n# Manual format (add abilities manually):\n"
+        yield "# CONVERSION FAILED: Using manual format instead\n"
+        yield "# You may need to manually add abilities or try the pokedata.ovh converter\n\n"
+        yield "# Original decklist format (copy to https://www.pokedata.ovh/misc/cardmarket):\n"
+        yield decklist_content
+        yield "\n# Manual format (add abilities manually):\n"
         for line in decklist_content.strip().split('\n'):
             if line.strip():
                 # Extract card name and set code for manual format
@@ -832,18 +896,17 @@ def generate_cardmarket_converted_want_list(want_lists):
                 if len(parts) >= 4:  # 1 CardName SetCode Number
                     card_name = ' '.join(parts[1:-2])  # Everything between count and set code
                     set_code = parts[-2]
-                    content += f"{card_name} [ABILITY] [{set_code}]\n"
-
-    return content
+                    yield f"{card_name} [ABILITY] [{set_code}]\n"
 
 def generate_legacy_report(all_cards):
     """Generate the legacy single-page report for compatibility"""
     # Simple single-page version for backwards compatibility
-    content = "<!DOCTYPE html><html><head><title>Pokemon Card Collection Report</title></head><body>"
-    content += "<h1>Pokemon Card Collection Report</h1>"
-    content += "<p>This is the legacy single-page report. Please use index.html for the modern interface.</p>"
-    content += "</body></html>"
-    return content
+    return ''.join([
+        "<!DOCTYPE html><html><head><title>Pokemon Card Collection Report</title></head><body>",
+        "<h1>Pokemon Card Collection Report</h1>",
+        "<p>This is the legacy single-page report. Please use index.html for the modern interface.</p>",
+        "</body></html>",
+    ])
 
 def process_all_cards(data):
     """Process the loaded data into the format expected by report generation"""
@@ -851,25 +914,24 @@ def process_all_cards(data):
     cm_cards = data['cardmarket_cards']
     set_mapping = data['set_mapping']
 
-    # Combine all cards by set code and number (same logic as original)
-    all_cards = {}
-
-    # Add TCG Collector cards first - now with variants
-    for card in tcg_cards:
-        key = f"{card.get('set_code', 'UNK')}_{card.get('number', 'XXX')}_{card.get('variant_type', 'Normal')}"
-        all_cards[key] = card.copy()
+    # Combine all cards by (set code, number, variant) - a tuple key avoids formatting a string per card.
+    # Add TCG Collector cards first - now with variants. The loaded cards belong to this run alone,
+    # so they're used as they are rather than copied before the pending flags are set on them
+    all_cards = {(card.get('set_code', 'UNK'), card.get('number', 'XXX'), card.get('variant_type', 'Normal')): card
+                 for card in tcg_cards}
 
     # Add Cardmarket cards, checking for duplicates
     for card in cm_cards:
         # Create the exact key for this specific variant
-        card_variant = card.get('variant_type', 'Normal')
-        card_key = f"{card.get('set_code', 'UNK')}_{card.get('number', 'XXX')}_{card_variant}"
+        get = card.get
+        card_key = (get('set_code', 'UNK'), get('number', 'XXX'), get('variant_type', 'Normal'))
 
-        # Check if we already have this exact variant
-        if card_key in all_cards:
+        # Check if we already have this exact variant (single lookup instead of three)
+        existing = all_cards.get(card_key)
+        if existing is not None:
             # Mark existing card as having pending delivery
-            all_cards[card_key]['status'] = 'pending_purchase'
-            all_cards[card_key]['cardmarket_pending'] = True
+            existing['status'] = 'pending_purchase'
+            existing['cardmarket_pending'] = True
         else:
             # New card from Cardmarket - add it with pending status
             card['status'] = 'pending_purchase'
@@ -881,6 +943,9 @@ def process_all_cards(data):
 
 def main(force_all=False):
     """Main report generation function"""
+    # One timestamp for the whole run, shared by every generated file that records it
+    generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
     print("Loading extracted card data...")
 
     data = load_data()
@@ -905,51 +970,63 @@ def main(force_all=False):
 
     print("Generating HTML reports...")
 
-    # Always regenerate overview pages (they're fast and may depend on multiple sets)
-    html_report = generate_legacy_report(all_cards)
-    output_file = Path("card_collection_report.html")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_report)
-    print(f"Legacy report generated: {output_file}")
+    # Group cards by set once - the overview, the individual set pages and the want lists all work from this
+    sets_by_name = group_cards_by_set(all_cards)
 
-    overview_html = generate_set_overview_page(all_cards)
+    # Always regenerate overview pages (they're fast and may depend on multiple sets)
+    legacy_file = Path("card_collection_report.html")
     overview_file = Path("index.html")
-    with open(overview_file, 'w', encoding='utf-8') as f:
-        f.write(overview_html)
-    print(f"Overview page generated: {overview_file}")
+    outputs = [
+        (legacy_file, generate_legacy_report(all_cards)),
+        (overview_file, generate_set_overview_page(sets_by_name, load_set_metrics(data, sets_by_name))),
+    ]
 
-    # Generate individual set pages (selective or all)
-    sets_by_name = {}
-    for card in all_cards.values():
-        set_name = card.get('set_name', 'Unknown')
-        if set_name not in sets_by_name:
-            sets_by_name[set_name] = []
-        sets_by_name[set_name].append(card)
+    # Set pages share one stylesheet and script instead of each embedding a copy,
+    # and the overview's stylesheet is likewise a separate file the browser can cache
+    for asset_name, asset_content in generate_report_assets().items():
+        outputs.append((Path(asset_name), asset_content))
 
-    sets_generated = 0
+    # Generate individual set pages (selective or all)
+    set_pages = []
+    set_card_counts = {}
     sets_skipped = 0
+    set_fingerprints = load_set_fingerprints()
 
     for set_name, set_cards in sets_by_name.items():
+        set_file = Path(f"{safe_set_filename(set_name)}.html")
+
         # Check if this set needs regeneration
         if not regenerate_all and set_name not in sets_to_regenerate:
             # Check if HTML file exists, if not, we must generate it
-            safe_filename = set_name.replace(' ', '_').replace('&', 'and').replace("'", "").replace('.', '')
-            set_file = Path(f"{safe_filename}.html")
             if set_file.exists():
                 sets_skipped += 1
                 continue
             else:
                 print(f"Set HTML missing, generating: {set_name}")
 
-        # Create safe filename for set
-        safe_filename = set_name.replace(' ', '_').replace('&', 'and').replace("'", "").replace('.', '')
+        # Skip rendering sets whose source files (and the page code/template) are exactly as they were
+        # when the existing page was generated - unless everything was explicitly asked for
+        fingerprint = set_fingerprint(data, set_name, set_cards)
+        if not force_all and set_file.exists() and set_fingerprints.get(set_name) == fingerprint:
+            sets_skipped += 1
+            continue
+        set_fingerprints[set_name] = fingerprint
+
+        set_pages.append((set_file, set_name, set_cards))
+        set_card_counts[set_file] = len(set_cards)
+
+    # Write everything concurrently, skipping files whose content is unchanged
+    written = write_output_files(outputs)
+    written.update(write_set_pages(set_pages))
+    save_set_fingerprints(set_fingerprints)
+    files_unchanged = sum(1 for was_written in written.values() if not was_written)
+
+    print(f"Legacy report {'generated' if written[legacy_file] else 'unchanged'}: {legacy_file}")
+    print(f"Overview page {'generated' if written[overview_file] else 'unchanged'}: {overview_file}")
+    for set_file, card_count in set_card_counts.items():
+        print(f"Set page {'generated' if written[set_file] else 'unchanged'}: {set_file} ({card_count} cards)")
 
-        set_html = generate_individual_set_page(set_name, set_cards)
-        set_file = Path(f"{safe_filename}.html")
-        with open(set_file, 'w', encoding='utf-8') as f:
-            f.write(set_html)
-        print(f"Set page generated: {set_file} ({len(set_cards)} cards)")
-        sets_generated += 1
+    sets_generated = len(set_card_counts)
 
     print(f"\nGenerated {2 + sets_generated} HTML files:")
     print(f"- index.html (overview)")
@@ -957,10 +1034,12 @@ def main(force_all=False):
     print(f"- {sets_generated} individual set pages")
     if sets_skipped > 0:
         print(f"- {sets_skipped} set pages skipped (unchanged)")
+    if files_unchanged > 0:
+        print(f"- {files_unchanged} files left untouched (content identical to last run)")
 
     # Generate want lists
     print(f"\nGenerating want lists...")
-    generate_want_lists(all_cards)
+    generate_want_lists(sets_by_name, generated_at)
 
     print("\nReport generation complete!")
     return 0
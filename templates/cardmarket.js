@@ -40,7 +40,7 @@ function generateCardmarketList() {
         }
 
         // Create decklist format
-        const setCode = '{{SET_CODE}}';
+        const setCode = document.body.dataset.setCode;
 
         // Deduplicate cards by name and number (ignore variants only)
         const uniqueCards = {};
@@ -0,0 +1,433 @@
+// Apply filters on page load
+window.onload = function() {
+    filterTable();
+};
+
+function calculateBaseSetSize(rows) {
+    // Find the largest card number that appears with multiple variants
+    // This indicates it's part of the base set (since secret rares typically don't have variants)
+    var cardCounts = {};
+
+    for (var i = 1; i < rows.length; i++) {
+        var cells = rows[i].getElementsByTagName("td");
+        var cardNumber = parseInt(cells[1].textContent);
+        var cardName = cells[3].textContent;
+
+        if (!isNaN(cardNumber)) {
+            var key = cardNumber + "_" + cardName;
+            cardCounts[key] = (cardCounts[key] || 0) + 1;
+        }
+    }
+
+    // Find the largest number that has multiple variants (normal + reverse holo)
+    var largestBaseCard = 0;
+    for (var key in cardCounts) {
+        if (cardCounts[key] > 1) {
+            var cardNumber = parseInt(key.split("_")[0]);
+            if (cardNumber > largestBaseCard) {
+                largestBaseCard = cardNumber;
+            }
+        }
+    }
+
+    // If no cards with variants found, use a reasonable default based on common set sizes
+    if (largestBaseCard === 0) {
+        // Look for gaps in numbering that might indicate secret rare boundary
+        var allNumbers = [];
+        for (var i = 1; i < rows.length; i++) {
+            var cells = rows[i].getElementsByTagName("td");
+            var cardNumber = parseInt(cells[1].textContent);
+            if (!isNaN(cardNumber)) {
+                allNumbers.push(cardNumber);
+            }
+        }
+        allNumbers.sort((a, b) => a - b);
+
+        // Find the largest number under 300 (reasonable set size limit)
+        for (var j = allNumbers.length - 1; j >= 0; j--) {
+            if (allNumbers[j] <= 300) {
+                largestBaseCard = allNumbers[j];
+                break;
+            }
+        }
+    }
+
+    return largestBaseCard || 198; // Default to 198 if calculation fails
+}
+
+function filterTable() {
+    var statusFilter = document.getElementById("statusFilter").value;
+    var variantFilter = document.getElementById("variantFilter").value;
+    var rarityFilter = document.getElementById("rarityFilter").value;
+    var searchBox = document.getElementById("searchBox").value.toLowerCase();
+    var table = document.getElementById("cardTable");
+    var rows = table.getElementsByTagName("tr");
+
+    // Calculate base set size (largest card number that appears frequently)
+    var baseSetSize = calculateBaseSetSize(rows);
+
+    // First pass: apply status, search, and rarity filters
+    var visibleRows = [];
+    for (var i = 1; i < rows.length; i++) {
+        var row = rows[i];
+        var cells = row.getElementsByTagName("td");
+        var cardName = cells[3].textContent.toLowerCase();
+        var cardNumber = parseInt(cells[1].textContent);
+        var status = cells[7].textContent;
+
+        var showRow = true;
+
+        // Filter by status
+        if (statusFilter !== "All" && status !== statusFilter) {
+            showRow = false;
+        }
+
+        // Filter by search
+        if (searchBox !== "" && !cardName.includes(searchBox)) {
+            showRow = false;
+        }
+
+        // Filter by rarity (base set vs secret rare)
+        if (rarityFilter === "Base Set" && cardNumber > baseSetSize) {
+            showRow = false;
+        } else if (rarityFilter === "Secret Rare" && cardNumber <= baseSetSize) {
+            showRow = false;
+        }
+
+        if (showRow) {
+            visibleRows.push(row);
+        } else {
+            row.style.display = "none";
+        }
+    }
+
+    // Second pass: apply variant filtering
+    var finalVisibleCount = 0;
+    if (variantFilter === "All") {
+        // Show all visible rows
+        visibleRows.forEach(function(row) {
+            row.style.display = "";
+            finalVisibleCount++;
+        });
+    } else if (variantFilter === "Best") {
+        // Group by card name + number, show best variant
+        var cardGroups = {};
+
+        visibleRows.forEach(function(row) {
+            var cells = row.getElementsByTagName("td");
+            var cardName = cells[3].textContent;
+            var cardNumber = cells[1].textContent;
+            var variant = cells[4].textContent;
+            var status = cells[7].textContent;
+            var hasCard = status === "Have" || status === "Have + Pending Delivery (Duplicate!)";
+
+            var key = cardName + "_" + cardNumber;
+
+            if (!cardGroups[key]) {
+                cardGroups[key] = [];
+            }
+
+            cardGroups[key].push({
+                row: row,
+                variant: variant,
+                hasCard: hasCard
+            });
+        });
+
+        // Hide all rows first
+        visibleRows.forEach(function(row) {
+            row.style.display = "none";
+        });
+
+        // Show best variant for each card
+        Object.keys(cardGroups).forEach(function(key) {
+            var group = cardGroups[key];
+            var bestRow = null;
+
+            // Priority: owned reverse holo > owned normal > unowned normal > unowned reverse holo
+            var ownedReverseHolo = group.find(function(item) {
+                return item.hasCard && item.variant === "Reverse Holo";
+            });
+            var ownedNormal = group.find(function(item) {
+                return item.hasCard && item.variant === "Normal";
+            });
+            var anyNormal = group.find(function(item) {
+                return item.variant === "Normal";
+            });
+            var anyReverseHolo = group.find(function(item) {
+                return item.variant === "Reverse Holo";
+            });
+
+            if (ownedReverseHolo) {
+                bestRow = ownedReverseHolo.row;
+            } else if (ownedNormal) {
+                bestRow = ownedNormal.row;
+            } else if (anyNormal) {
+                bestRow = anyNormal.row;
+            } else if (anyReverseHolo) {
+                bestRow = anyReverseHolo.row;
+            } else if (group.length > 0) {
+                bestRow = group[0].row; // fallback to first row
+            }
+
+            if (bestRow) {
+                bestRow.style.display = "";
+                finalVisibleCount++;
+            }
+        });
+    } else {
+        // Filter by specific variant
+        visibleRows.forEach(function(row) {
+            var cells = row.getElementsByTagName("td");
+            var variant = cells[4].textContent;
+
+            if (variant === variantFilter) {
+                row.style.display = "";
+                finalVisibleCount++;
+            } else {
+                row.style.display = "none";
+            }
+        });
+    }
+
+    // Update visible count display
+    var totalRows = document.getElementById("cardTable").getElementsByTagName("tr").length - 1; // -1 for header
+    var countElement = document.getElementById("visibleCount");
+    if (finalVisibleCount === totalRows) {
+        countElement.textContent = "Showing all " + totalRows + " cards";
+    } else {
+        countElement.textContent = "Showing " + finalVisibleCount + " of " + totalRows + " cards";
+    }
+}
+
+function sortTable(columnIndex) {
+    var table = document.getElementById("cardTable");
+    var tbody = table.getElementsByTagName("tbody")[0];
+    var rows = Array.from(tbody.getElementsByTagName("tr"));
+
+    rows.sort(function(a, b) {
+        var aValue = a.getElementsByTagName("td")[columnIndex].textContent;
+        var bValue = b.getElementsByTagName("td")[columnIndex].textContent;
+
+        // Try to parse as numbers for numeric columns
+        if (columnIndex === 1) { // Card Number column
+            var aNum = parseInt(aValue);
+            var bNum = parseInt(bValue);
+            if (!isNaN(aNum) && !isNaN(bNum)) {
+                return aNum - bNum;
+            }
+        }
+
+        return aValue.localeCompare(bValue);
+    });
+
+    rows.forEach(function(row) {
+        tbody.appendChild(row);
+    });
+}
+
+// Image URLs found for cards are kept in localStorage so they're shared across
+// set pages and later visits instead of re-fetching the card page every time
+const IMAGE_URL_STORAGE_KEY = 'cardImageUrls';
+
+function loadStoredImageUrls() {
+    try {
+        return JSON.parse(localStorage.getItem(IMAGE_URL_STORAGE_KEY)) || {};
+    } catch (error) {
+        return {};
+    }
+}
+
+function storeImageUrl(cardId, imageUrl) {
+    try {
+        const stored = loadStoredImageUrls();
+        stored[cardId] = imageUrl;
+        localStorage.setItem(IMAGE_URL_STORAGE_KEY, JSON.stringify(stored));
+    } catch (error) {
+        // Storage can be unavailable (private browsing, file:// restrictions) - the in-memory cache still works
+    }
+}
+
+let cardPreviewElement = null;
+let cardImageCache = loadStoredImageUrls();
+let hideTimeout = null;
+
+// Card image URLs on a TCG Collector card page; the literal prefix is checked first
+// so pages without an image skip the regex scan entirely
+const CARD_IMAGE_PREFIX = 'static.tcgcollector.com/content/images/';
+const CARD_IMAGE_RE = /https:\/\/static\.tcgcollector\.com\/content\/images\/[a-f0-9\/]+\.(?:jpg|webp|png)/;
+
+// Preview contents are built once and swapped in with replaceChildren,
+// rather than re-parsing an HTML string on every hover
+let previewImage = null;
+let previewLoading = null;
+let previewLink = null;
+let previewLinkAnchor = null;
+
+function buildPreviewNodes() {
+    previewImage = new Image();
+    previewImage.alt = 'Card preview';
+
+    previewLoading = document.createElement('div');
+    previewLoading.style.padding = '10px';
+    previewLoading.textContent = 'Loading...';
+
+    // CORS fallback: link to the card page instead of showing the image
+    previewLink = document.createElement('div');
+    previewLink.style.padding = '10px';
+    previewLink.style.textAlign = 'center';
+    const linkParagraph = document.createElement('p');
+    previewLinkAnchor = document.createElement('a');
+    previewLinkAnchor.target = '_blank';
+    previewLinkAnchor.style.color = '#007bff';
+    previewLinkAnchor.textContent = 'View card on TCG Collector';
+    linkParagraph.append('🔗 ', previewLinkAnchor);
+    const linkNote = document.createElement('small');
+    linkNote.textContent = 'Image preview blocked by CORS';
+    previewLink.append(linkParagraph, linkNote);
+}
+
+function showPreviewImage(imageUrl) {
+    previewImage.src = imageUrl;
+    cardPreviewElement.replaceChildren(previewImage);
+}
+
+function showPreviewLink(cardId) {
+    previewLinkAnchor.href = `https://www.tcgcollector.com/cards/${cardId}/`;
+    cardPreviewElement.replaceChildren(previewLink);
+}
+
+async function showCardPreview(event, cardId) {
+    // Clear any pending hide timeout
+    if (hideTimeout) {
+        clearTimeout(hideTimeout);
+        hideTimeout = null;
+    }
+    if (!cardId) return;
+
+    // Create preview element if it doesn't exist
+    if (!cardPreviewElement) {
+        cardPreviewElement = document.createElement('div');
+        cardPreviewElement.className = 'card-preview';
+
+        // Add hover events to keep popup visible when hovering over it
+        cardPreviewElement.addEventListener('mouseenter', function() {
+            if (hideTimeout) {
+                clearTimeout(hideTimeout);
+                hideTimeout = null;
+            }
+        });
+
+        cardPreviewElement.addEventListener('mouseleave', function() {
+            hideCardPreview();
+        });
+
+        document.body.appendChild(cardPreviewElement);
+        buildPreviewNodes();
+    }
+
+    // Position the preview near the mouse cursor, accounting for scroll position
+    const rect = event.target.getBoundingClientRect();
+    const scrollLeft = window.pageXOffset || document.documentElement.scrollLeft;
+    const scrollTop = window.pageYOffset || document.documentElement.scrollTop;
+
+    cardPreviewElement.style.left = (rect.right + scrollLeft + 10) + 'px';
+    cardPreviewElement.style.top = (rect.top + scrollTop) + 'px';
+
+    // Check if we have the image URL cached
+    if (cardImageCache[cardId]) {
+        if (cardImageCache[cardId] !== 'failed' && cardImageCache[cardId] !== 'link') {
+            showPreviewImage(cardImageCache[cardId]);
+            cardPreviewElement.style.display = 'block';
+        } else if (cardImageCache[cardId] === 'link') {
+            showPreviewLink(cardId);
+            cardPreviewElement.style.display = 'block';
+        }
+        return;
+    }
+
+    // Show loading message
+    cardPreviewElement.replaceChildren(previewLoading);
+    cardPreviewElement.style.display = 'block';
+
+    try {
+        // Try to fetch the card detail page to get the actual image URL
+        // Note: This will likely fail due to CORS, but we'll provide a fallback
+        fetch(`https://www.tcgcollector.com/cards/${cardId}/`)
+            .then(response => response.text())
+            .then(html => {
+                // Extract the image URL from the HTML - handle multiple formats
+                const prefixIndex = html.indexOf(CARD_IMAGE_PREFIX);
+                const imageMatch = prefixIndex >= 0 ? CARD_IMAGE_RE.exec(html.slice(Math.max(0, prefixIndex - 8))) : null;
+                if (imageMatch) {
+                    const imageUrl = imageMatch[0];
+                    cardImageCache[cardId] = imageUrl;
+                    storeImageUrl(cardId, imageUrl);
+                    if (cardPreviewElement.style.display === 'block') {
+                        showPreviewImage(imageUrl);
+                    }
+                } else {
+                    throw new Error('Image URL not found');
+                }
+            })
+            .catch(error => {
+                // CORS fallback: Show card link instead of image
+                console.log('CORS prevented image fetch, showing link instead:', error);
+                cardImageCache[cardId] = 'link';
+                if (cardPreviewElement.style.display === 'block') {
+                    showPreviewLink(cardId);
+                }
+            });
+
+    } catch (error) {
+        console.log('Error loading card preview:', error);
+        cardPreviewElement.style.display = 'none';
+        cardImageCache[cardId] = 'failed';
+    }
+}
+
+// The set header's progress bar carries the raw owned/pending/total counts; split it here,
+// the same way the overview page sizes its bars
+const setProgressBar = document.querySelector('.set-header .progress-bar');
+if (setProgressBar) {
+    const owned = Number(setProgressBar.dataset.owned);
+    const pending = Number(setProgressBar.dataset.pending);
+    const total = Number(setProgressBar.dataset.total);
+
+    const completionPercent = total > 0 ? (owned / total * 100) : 0;
+    const pendingPercent = total > 0 ? (pending / total * 100) : 0;
+    const totalPercent = completionPercent + pendingPercent;
+
+    setProgressBar.querySelector('.progress-fill').style.width = totalPercent.toFixed(1) + '%';
+    if (totalPercent > 0) {
+        setProgressBar.querySelector('.progress-owned').style.width = (completionPercent / totalPercent * 100).toFixed(1) + '%';
+        setProgressBar.querySelector('.progress-pending').style.width = (pendingPercent / totalPercent * 100).toFixed(1) + '%';
+    }
+}
+
+// Camera icons carry their card id in data-card-id; one pair of listeners on the table
+// handles every row instead of inline handlers repeated on each icon
+const cardTable = document.getElementById('cardTable');
+if (cardTable) {
+    cardTable.addEventListener('mouseover', function(event) {
+        const icon = event.target.closest('.camera-icon');
+        if (icon && !icon.contains(event.relatedTarget)) {
+            showCardPreview({ target: icon }, icon.dataset.cardId);
+        }
+    });
+    cardTable.addEventListener('mouseout', function(event) {
+        const icon = event.target.closest('.camera-icon');
+        if (icon && !icon.contains(event.relatedTarget)) {
+            hideCardPreview();
+        }
+    });
+}
+
+function hideCardPreview() {
+    // Use a small delay to allow moving mouse to the preview popup
+    hideTimeout = setTimeout(function() {
+        if (cardPreviewElement) {
+            cardPreviewElement.style.display = 'none';
+        }
+    }, 100);
+}
@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
 
-import html
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import extract_data
+import generate_reports
 
 def test_template_generation():
     """Test the new template-based generation"""
@@ -10,22 +16,24 @@ def test_template_generation():
     set_code = "TST"
     set_cards = [
         {
-            'number': '001',
+            'number': '002',
             'total_count': '10',
-            'name': 'Test Card 1',
-            'variant_type': 'Normal',
-            'card_id': '12345',
-            'has_card': False,
+            'name': 'Test Card 2 <EX>',
+            'variant_type': 'Reverse Holo',
+            'set_code': set_code,
+            'card_id': '12346',
+            'has_card': True,
             'cardmarket_pending': False,
             'source': 'tcg_collector'
         },
         {
-            'number': '002',
+            'number': '001',
             'total_count': '10',
-            'name': 'Test Card 2',
-            'variant_type': 'Reverse Holo',
-            'card_id': '12346',
-            'has_card': True,
+            'name': 'Test Card 1',
+            'variant_type': 'Normal',
+            'set_code': set_code,
+            'card_id': '12345',
+            'has_card': False,
             'cardmarket_pending': False,
             'source': 'tcg_collector'
         }
@@ -34,61 +42,16 @@ def test_template_generation():
     # Calculate statistics
     total_cards = len(set_cards)
     owned_cards = sum(1 for card in set_cards if card.get('has_card'))
-    pending_cards = sum(1 for card in set_cards if card.get('cardmarket_pending'))
     completion_percent = (owned_cards / total_cards * 100) if total_cards > 0 else 0
 
-    # Load templates
-    with open('templates/set_page.html', 'r', encoding='utf-8') as f:
-        html_template = f.read()
+    with open('templates/report.js', 'r', encoding='utf-8') as f:
+        js_code = f.read()
 
     with open('templates/cardmarket.js', 'r', encoding='utf-8') as f:
-        js_template = f.read()
-
-    # Generate card rows
-    card_rows_html = ""
-    for card in set_cards:
-        number = card.get('number', 'XXX')
-        total_count = card.get('total_count') or ''
-        name = card.get('name', 'Unknown')
-        variant = card.get('variant_type', 'Normal')
-        card_id = card.get('card_id')
-
-        camera_icon_html = ''
-        if card_id:
-            camera_icon_html = f'<span class="camera-icon" onmouseover="showCardPreview(event, \'{card_id}\')" onmouseout="hideCardPreview()">📷</span>'
-
-        have = '✓' if card.get('has_card') else '✗'
-
-        if card.get('has_card'):
-            status = 'Have'
-            row_class = 'has-card'
-        else:
-            status = 'Need'
-            row_class = 'missing-card'
-
-        card_rows_html += f"""
-            <tr class="{row_class}">
-                <td style="text-align: center;">{camera_icon_html}</td>
-                <td>{html.escape(number)}</td>
-                <td>{html.escape(total_count)}</td>
-                <td>{html.escape(name)}</td>
-                <td>{html.escape(variant)}</td>
-                <td>{have}</td>
-                <td>{status}</td>
-            </tr>"""
-
-    # Replace JavaScript placeholders
-    js_code = js_template.replace('{{SET_CODE}}', set_code)
-
-    # Replace HTML placeholders
-    html_content = html_template.replace('{{SET_NAME}}', html.escape(set_name))
-    html_content = html_content.replace('{{SET_CODE}}', html.escape(set_code))
-    html_content = html_content.replace('{{TOTAL_CARDS}}', str(total_cards))
-    html_content = html_content.replace('{{OWNED_CARDS}}', str(owned_cards))
-    html_content = html_content.replace('{{PENDING_CARDS}}', str(pending_cards))
-    html_content = html_content.replace('{{COMPLETION_PERCENT}}', str(completion_percent))
-    html_content = html_content.replace('{{CARD_ROWS}}', card_rows_html)
-    html_content = html_content.replace('{{CARDMARKET_JS}}', js_code)
+        js_code += '\n' + f.read() + '\n'
+
+    # Render the page exactly as the report generator does, rows included
+    html_content = ''.join(generate_reports.iter_individual_set_page(set_name, set_cards))
 
     # Write test file
     with open('test_template_output.html', 'w', encoding='utf-8') as f:
@@ -99,11 +62,98 @@ def test_template_generation():
     print(f"✅ Set: {set_name} ({set_code})")
     print(f"✅ Cards: {total_cards} total, {owned_cards} owned ({completion_percent:.1f}% complete)")
 
-    # Verify JavaScript
-    if 'generateCardmarketList' in js_code and '{{SET_CODE}}' not in js_code:
+    # Rows come out sorted by number, escaped, and with every placeholder filled in
+    if (html_content.find('Test Card 1') < html_content.find('Test Card 2')
+            and 'Test Card 2 &lt;EX&gt;' in html_content and '{{' not in html_content):
+        print("✅ Card rows rendered in order and escaped")
+    else:
+        print("❌ Card row rendering issue")
+
+    # Verify JavaScript - the set code is read from the page's data-set-code attribute
+    if 'generateCardmarketList' in js_code and '{{' not in js_code and 'data-set-code="TST"' in html_content:
         print("✅ JavaScript properly generated with clean syntax")
     else:
         print("❌ JavaScript generation issue")
 
+def test_search_from_literal():
+    """search_from_literal finds the same match as pattern.search, whatever the case of the page"""
+    pages = [
+        '<html><title>Surging Sparks card list (International TCG) – TCG Collector</title></html>',
+        '<HTML><TITLE>Surging Sparks card list (International TCG) – TCG Collector</TITLE></HTML>',
+        '<title>not it</title><title>Obscure Set card list (International TCG) – TCG Collector</title>',
+        '<html>no title here</html>',
+    ]
+    for page in pages:
+        expected = extract_data.PAGE_TITLE_PATTERN.search(page)
+        match = extract_data.search_from_literal(extract_data.PAGE_TITLE_PATTERN, '<title>', page, page.lower())
+        assert (match and match.span()) == (expected and expected.span()), page
+        # Without a lowercased copy it is a plain pattern.search
+        match = extract_data.search_from_literal(extract_data.PAGE_TITLE_PATTERN, '<title>', page)
+        assert (match and match.span()) == (expected and expected.span()), page
+    print("✅ search_from_literal matches pattern.search")
+
+def test_index_card_blocks():
+    """Each card's block runs from its first data-card-id up to the tag holding the next card's"""
+    page = ('<div data-card-id="1">A <span data-card-id="1">again</span></div>'
+            '<div data-card-id="2">B</div>'
+            '<DIV DATA-CARD-ID="3">C</DIV>')
+    blocks = extract_data.index_card_blocks(page)
+    assert list(blocks) == ['1', '2', '3'], blocks
+    assert page[slice(*blocks['1'])] == 'data-card-id="1">A <span data-card-id="1">again</span></div>', blocks
+    assert page[slice(*blocks['2'])] == 'data-card-id="2">B</div>', blocks
+    assert page[slice(*blocks['3'])] == 'DATA-CARD-ID="3">C</DIV>', blocks
+    assert extract_data.index_card_blocks('<div>no cards</div>') == {}
+    print("✅ index_card_blocks splits the page per card")
+
+def test_iter_json_chunks():
+    """iter_json_chunks writes the same bytes as json.dumps(indent=2, ensure_ascii=False)"""
+    if extract_data.orjson is None:
+        print("⚠️ orjson not installed, skipping iter_json_chunks check")
+        return
+    data = {
+        'extraction_timestamp': '2024-01-01T00:00:00',
+        'tcg_cards': [
+            {'name': 'Pokémon – Pikachu', 'number': '025', 'has_card': True, 'rarity_data': {'text': 'Common'}},
+            {'name': 'Eevee', 'number': '133', 'has_card': False, 'rarity_data': None},
+        ],
+        'cardmarket_cards': [],
+        'set_mapping': {'SSP': 'Surging Sparks'},
+        'source_files_by_set': {'Surging Sparks': ['data/a.html']},
+        'stats': {'total_tcg_cards': 2, 'nested': {'empty': {}, 'list': [1, 2]}},
+    }
+    expected = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    assert b''.join(extract_data.iter_json_chunks(data)) == expected
+    assert b''.join(extract_data.iter_json_chunks({})) == json.dumps({}, indent=2).encode('utf-8')
+    print("✅ iter_json_chunks matches json.dumps(indent=2)")
+
+def test_write_file_if_changed_unhashed_prefix():
+    """A streamed file differing only in its unhashed timestamp line is left as it is"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            path = Path('want_list.txt')
+            prefix = '# Generated on '
+            assert generate_reports.write_file_if_changed(path, iter([f'{prefix}2024-01-01\n', '1 Pikachu\n']), prefix)
+            # Only the timestamp differs: not rewritten, so the old timestamp stays
+            assert not generate_reports.write_file_if_changed(path, iter([f'{prefix}2024-02-02\n', '1 Pikachu\n']), prefix)
+            assert path.read_text(encoding='utf-8') == f'{prefix}2024-01-01\n1 Pikachu\n'
+            assert not list(Path('.').glob('*.tmp'))
+            # A real change is written, timestamp and all
+            assert generate_reports.write_file_if_changed(path, iter([f'{prefix}2024-03-03\n', '2 Pikachu\n']), prefix)
+            assert path.read_text(encoding='utf-8') == f'{prefix}2024-03-03\n2 Pikachu\n'
+            # With the recorded hash gone (e.g. .cache cleared), the file itself is compared, timestamp left out
+            for hash_file in generate_reports.HASH_CACHE_DIR.iterdir():
+                hash_file.unlink()
+            assert not generate_reports.write_file_if_changed(path, iter([f'{prefix}2024-04-04\n', '2 Pikachu\n']), prefix)
+            assert path.read_text(encoding='utf-8') == f'{prefix}2024-03-03\n2 Pikachu\n'
+        finally:
+            os.chdir(cwd)
+    print("✅ write_file_if_changed ignores the unhashed prefix")
+
 if __name__ == "__main__":
-    test_template_generation()
\ No newline at end of file
+    test_template_generation()
+    test_search_from_literal()
+    test_index_card_blocks()
+    test_iter_json_chunks()
+    test_write_file_if_changed_unhashed_prefix()